@@ -71,7 +71,11 @@ export class PythonAgent extends EventEmitter {
 
   sendRaw(msg) {
     if (!this.proc) throw new Error("Python not started");
-    this.proc.stdin.write(JSON.stringify(msg) + "\n");
+    // Length-prefixed frame: 4-byte big-endian byte count, then the JSON payload
+    const body = Buffer.from(JSON.stringify(msg), "utf8");
+    const header = Buffer.alloc(4);
+    header.writeUInt32BE(body.length, 0);
+    this.proc.stdin.write(Buffer.concat([header, body]));
   }
 
   runGoal({ goal, target_app = null, max_iterations = 5 }) {
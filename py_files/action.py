@@ -3,12 +3,111 @@
 Action Engine - Handles all action execution using accessibility APIs
 """
 
+import logging
+import os
+import re
 import time
+import threading
 import atomacos as atomac
-from typing import Dict, List, Any, Optional
+from AppKit import NSWorkspace
+from ApplicationServices import (
+    AXObserverAddNotification,
+    AXObserverCreate,
+    AXObserverGetRunLoopSource,
+    AXUIElementCreateApplication,
+    AXUIElementGetPid,
+    kAXLayoutChangedNotification,
+    kAXValueChangedNotification,
+)
+from CoreFoundation import (
+    CFRunLoopAddSource,
+    CFRunLoopGetCurrent,
+    CFRunLoopRemoveSource,
+    CFRunLoopRunInMode,
+    kCFRunLoopDefaultMode,
+    kCFRunLoopRunHandledSource,
+)
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Any, Optional, Union
 from dataclasses import dataclass
 from PIL import Image
 import io
+import numpy as np
+from Quartz import (
+    CGDataProviderCopyData,
+    CGDisplayBounds,
+    CGEventCreateKeyboardEvent,
+    CGEventCreateMouseEvent,
+    CGEventKeyboardSetUnicodeString,
+    CGEventPost,
+    CGEventSetFlags,
+    CGImageGetBytesPerRow,
+    CGImageGetDataProvider,
+    CGImageGetHeight,
+    CGImageGetWidth,
+    CGMainDisplayID,
+    CGRectMake,
+    CGWindowListCreateImage,
+    kCGEventFlagMaskCommand,
+    kCGEventLeftMouseDown,
+    kCGEventLeftMouseUp,
+    kCGHIDEventTap,
+    kCGMouseButtonLeft,
+    kCGNullWindowID,
+    kCGWindowImageDefault,
+    kCGWindowListOptionOnScreenOnly,
+)
+
+# Virtual key codes (ANSI layout) used by the keyboard helpers
+KEY_CODE_A = 0
+KEY_CODE_RETURN = 36
+KEY_CODE_DELETE = 51
+
+# CGEventKeyboardSetUnicodeString only carries a short string per event
+_UNICODE_CHUNK = 20
+
+# One pool for fanning out per-app AX probes (IPC-bound, so threads overlap),
+# shared by every ActionEngine so engines don't each leave idle workers behind
+_PROBE_POOL = ThreadPoolExecutor(max_workers=6, thread_name_prefix="ax-probe")
+
+# Element roles each action type can be applied to (types not listed accept any role)
+_VERBS = {
+    "click": frozenset({"AXButton", "AXPopUpButton", "AXCheckBox", "AXRadioButton"}),
+    "type": frozenset({"AXTextField", "AXTextArea"}),
+    "select": frozenset({"AXPopUpButton", "AXComboBox"}),
+}
+
+try:
+    from numba import njit, prange
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+if NUMBA_AVAILABLE:
+
+    # No eager signature: crops may arrive as read-only arrays (np.asarray of a PIL image)
+    @njit(parallel=True, cache=True)
+    def _count_diff_pixels(a, b, tolerance):
+        """Count pixels whose summed RGB difference exceeds tolerance (compiled)"""
+        diff = 0
+        for i in prange(a.shape[0]):
+            for j in range(a.shape[1]):
+                delta = (
+                    abs(np.int64(a[i, j, 0]) - np.int64(b[i, j, 0]))
+                    + abs(np.int64(a[i, j, 1]) - np.int64(b[i, j, 1]))
+                    + abs(np.int64(a[i, j, 2]) - np.int64(b[i, j, 2]))
+                )
+                if delta > tolerance:
+                    diff += 1
+        return diff
+
+else:
+
+    def _count_diff_pixels(a, b, tolerance):
+        """Count pixels whose summed RGB difference exceeds tolerance"""
+        delta = np.abs(a.astype(np.int16) - b.astype(np.int16)).sum(axis=2)
+        return np.count_nonzero(delta > tolerance)
 
 
 @dataclass
@@ -33,65 +132,148 @@ class ActionEngine:
     - Visual verification of actions
     """
 
+    # How long a window's element snapshot stays valid (seconds)
+    _SNAPSHOT_TTL = 0.5
+
+    # How long a resolved target -> element handle is reused (seconds)
+    _ELEMENT_TTL = 0.5
+
+    # Position-encoded element IDs: role_x_y, e.g. "AXButton_533.0_310.0"
+    _POS_ID_RE = re.compile(r"^([A-Za-z]+)_(-?\d+(?:\.\d+)?)_(-?\d+(?:\.\d+)?)$")
+
+    # Action types that consume before/after screenshots (only click verifies today)
+    _VERIFY_TYPES = {"click"}
+
+    # Fraction of pixels that must differ for a crop to count as changed
+    _CHANGE_THRESHOLD = 0.05
+
+    # Grayscale thumbnail pre-check for image diffs: size, and the mean intensity
+    # delta (0-255) below which nothing changed
+    _DIFF_THUMB_SIZE = (64, 64)
+    _DIFF_THUMB_EPSILON = 0.5
+
+    # Summed RGB delta a pixel must exceed to count as changed (absorbs AA/gamma noise)
+    _PIXEL_DIFF_TOLERANCE = 24
+
+    # Row band height for the diff; byte-identical bands are skipped outright
+    _DIFF_BAND_ROWS = 32
+
+    # How long a full-screen capture is reused for the same target app (seconds)
+    _SCREENSHOT_TTL = 0.15
+
+    # Post-action settle polling: interval, overall cap, and "stable" diff fraction
+    _SETTLE_INTERVAL = 0.03
+    _SETTLE_TIMEOUT = 0.6
+    _SETTLE_MAX_POLLS = 20
+    _SETTLE_EPSILON = 0.001
+
     def __init__(self):
+        self._log = logging.getLogger(__name__)
         self.action_history = []
+
+        # Running totals over action_history (sequences may append from worker threads)
+        self._history_lock = threading.Lock()
+        self._n_total = 0
+        self._n_ok = 0
+        self._types = set()
         self.visual_verification_enabled = True
         self.max_retries = 3
         self.action_timeout = 10.0
 
+        # Running applications indexed by pid (and pid by localized name)
+        self._running_by_pid = {}
+        self._pid_by_name = {}
+        self._refresh_running_apps()
+
+        # Pixels per point of the last in-memory screen capture (2.0 on Retina)
+        self._screen_scale = 1.0
+
+        # Per-window attribute snapshots keyed by AX window ref: (taken_at, columns)
+        self._window_snapshots = {}
+        # _PROBE_POOL workers snapshot windows concurrently
+        self._snapshot_lock = threading.Lock()
+
+        # VLM analyzer is only needed for the fallback capture; created on first use
+        self._vlm = None
+
+        # Recent full-screen captures keyed by target app: (taken_at, screenshot)
+        self._ss_cache = {}
+
+        # Recently resolved elements keyed by target string: (found_at, element)
+        self._el_cache = {}
+
+        # action type -> (method, extractor returning the method's positional args)
+        self._dispatch = {
+            "click": (self._execute_click, lambda a: (a.get("target", ""),)),
+            "type": (
+                self._execute_type,
+                lambda a: (a.get("target", ""), a.get("text", a.get("option", ""))),
+            ),
+            "select": (
+                self._execute_select,
+                lambda a: (a.get("target", ""), a.get("text", a.get("option", ""))),
+            ),
+            "keystroke": (
+                self._execute_keystroke,
+                lambda a: (a.get("target", ""), a.get("text", "")),
+            ),
+            "scroll": (
+                self._execute_scroll,
+                lambda a: (a.get("target", ""), a.get("direction", "down")),
+            ),
+            "wait": (self._execute_wait, lambda a: (a.get("duration", 1.0),)),
+            "key": (self._execute_key, lambda a: (a.get("key", ""),)),
+            # "press" is a key press; default to Enter
+            "press": (self._execute_key, lambda a: (a.get("key", "enter"),)),
+            "launch_app": (
+                self._execute_launch_app,
+                lambda a: (a.get("app_name", a.get("target", "")),),
+            ),
+        }
+
+    @property
+    def vlm(self):
+        """Shared VLM analyzer instance, created lazily on first use"""
+        if self._vlm is None:
+            from model.gemini import VLMAnalyzer
+
+            self._vlm = VLMAnalyzer()
+        return self._vlm
+
     def execute_action(self, action: Dict[str, Any]) -> Dict[str, Any]:
         """Execute a single action"""
         action_type = action.get("action", "").lower()
         target = action.get("target", "")
         reason = action.get("reason", "")
 
-        print(f"      🎯 Executing: {action_type} on {target}")
-
-        # VERBOSE: Print full action details
-        print(f"      📋 Full action details: {action}")
+        self._log.debug("      🎯 Executing: %s on %s", action_type, target)
+        self._log.debug("      📋 Full action details: %s", action)
 
         try:
-            # Dynamic action execution based on action type
-            action_method = getattr(self, f"_execute_{action_type}", None)
-            if action_method:
-                print(f"      🔧 Using method: _execute_{action_type}")
-                # Call the appropriate method with parameters
-                if action_type in ["type", "select"]:
-                    text_or_option = action.get("text", action.get("option", ""))
-                    print(f"      📝 Text/option: '{text_or_option}'")
-                    result = action_method(target, text_or_option)
-                elif action_type in ["keystroke"]:
-                    text = action.get("text", "")
-                    print(f"      ⌨️  Keystroke text: '{text}'")
-                    result = action_method(target, text)
-                elif action_type in ["scroll"]:
-                    direction = action.get("direction", "down")
-                    print(f"      📜 Direction: {direction}")
-                    result = action_method(target, direction)
-                elif action_type in ["wait"]:
-                    duration = action.get("duration", 1.0)
-                    print(f"      ⏱️  Duration: {duration}")
-                    result = action_method(duration)
-                elif action_type in ["key"]:
-                    key = action.get("key", "")
-                    print(f"      ⌨️  Key: '{key}'")
-                    result = action_method(key)
-                elif action_type in ["press"]:
-                    # Convert press to key action
-                    key = action.get("key", "enter")
-                    print(f"      ⌨️  Converting press to key: '{key}'")
-                    result = self._execute_key(key)
-                elif action_type in ["launch_app"]:
-                    app_name = action.get("app_name", target)
-                    print(f"      🚀 App name: '{app_name}'")
-                    result = action_method(app_name)
+            entry = self._dispatch.get(action_type)
+            if entry:
+                method, extract_args = entry
+                self._log.debug("      🔧 Using method: %s", method.__name__)
+                if action_type in self._VERIFY_TYPES:
+                    # Actions may opt out of visual verification with "verify": false
+                    result = method(
+                        *extract_args(action), verify=bool(action.get("verify", True))
+                    )
                 else:
-                    print(f"      🎯 Simple target: '{target}'")
-                    result = action_method(target)
+                    result = method(*extract_args(action))
             else:
-                print(f"      ⚠️  No specific method found, using generic action")
-                # Try to execute as a generic action
-                result = self._execute_generic_action(action_type, target, action)
+                # Other _execute_* helpers (e.g. press_enter) just take the target
+                action_method = getattr(self, f"_execute_{action_type}", None)
+                if action_method:
+                    self._log.debug("      🔧 Using method: _execute_%s", action_type)
+                    self._log.debug("      🎯 Simple target: '%s'", target)
+                    result = action_method(target)
+                else:
+                    self._log.debug(
+                        "      ⚠️  No specific method found, using generic action"
+                    )
+                    # Try to execute as a generic action
+                    result = self._execute_generic_action(action_type, target, action)
 
             # Store action result
             action_result = ActionResult(
@@ -103,12 +285,24 @@ class ActionEngine:
                 timestamp=time.time(),
             )
 
-            self.action_history.append(action_result)
+            with self._history_lock:
+                self.action_history.append(action_result)
+                self._n_total += 1
+                self._n_ok += action_result.success
+                self._types.add(action_type)
 
-            if result.get("success", False):
-                print(f"      ✅ Action successful: {action_type}")
-            else:
-                print(f"      ❌ Action failed: {result.get('error', 'Unknown error')}")
+            # The UI has moved on; cached captures and elements no longer reflect it
+            if action_result.success:
+                self._ss_cache.clear()
+                self._el_cache.clear()
+
+            if self._log.isEnabledFor(logging.DEBUG):
+                if result.get("success", False):
+                    self._log.debug("      ✅ Action successful: %s", action_type)
+                else:
+                    self._log.debug(
+                        "      ❌ Action failed: %s", result.get("error", "Unknown error")
+                    )
 
             return {
                 "success": result.get("success", False),
@@ -120,7 +314,7 @@ class ActionEngine:
             }
 
         except Exception as e:
-            print(f"      ❌ Action execution error: {e}")
+            self._log.warning("      ❌ Action execution error: %s", e)
             return {
                 "success": False,
                 "action": action_type,
@@ -129,12 +323,14 @@ class ActionEngine:
                 "timestamp": time.time(),
             }
 
-    def _execute_click(self, target: str) -> Dict[str, Any]:
+    def _execute_click(self, target: str, verify: bool = True) -> Dict[str, Any]:
         """Execute a click action with multiple fallback methods"""
         try:
             # Handle "all" target for system-wide actions
             if target == "all":
-                print(f"      ⚠️  Cannot click 'all' - this is not a valid click target")
+                self._log.debug(
+                    "      ⚠️  Cannot click 'all' - this is not a valid click target"
+                )
                 return {
                     "success": False,
                     "error": "Cannot click 'all' - use keystroke action instead",
@@ -147,8 +343,9 @@ class ActionEngine:
 
             # Visual verification: Capture before state
             before_state = None
-            if self.visual_verification_enabled:
-                before_state = self.capture_before_screenshot(target)
+            verify = verify and self.visual_verification_enabled
+            if verify:
+                before_state = self.capture_before_screenshot(target, element=element)
 
             # Try multiple click methods
             try:
@@ -157,17 +354,13 @@ class ActionEngine:
                     element.AXPress()
 
                     # Visual verification: Check if click actually happened
-                    if (
-                        self.visual_verification_enabled
-                        and before_state
-                        and before_state.get("success")
-                    ):
+                    if verify and before_state and before_state.get("success"):
                         verification_result = self.verify_action_visually(
                             target, before_state
                         )
                         if not verification_result.get("verified"):
-                            print(
-                                f"      ⚠️  Click may have failed - no visual change detected"
+                            self._log.debug(
+                                "      ⚠️  Click may have failed - no visual change detected"
                             )
                             return {
                                 "success": False,
@@ -187,27 +380,24 @@ class ActionEngine:
 
                 # Try mouse click simulation
                 try:
-                    import subprocess
-
-                    pos = getattr(element, "AXPosition", None)
-                    if pos:
-                        # Use osascript to click at the element position
-                        subprocess.run(
-                            [
-                                "osascript",
-                                "-e",
-                                f'tell application "System Events" to click at {{{pos.x}, {pos.y}}}',
-                            ]
-                        )
-                        return {
-                            "success": True,
-                            "result": f"Clicked {target} at position ({pos.x}, {pos.y})",
-                        }
+                    # The before state already holds the position; don't ask AX again
+                    if before_state and before_state.get("success"):
+                        x, y = before_state["position"]
                     else:
-                        return {
-                            "success": False,
-                            "error": f"Could not get position for {target}",
-                        }
+                        pos = getattr(element, "AXPosition", None)
+                        if not pos:
+                            return {
+                                "success": False,
+                                "error": f"Could not get position for {target}",
+                            }
+                        x, y = pos.x, pos.y
+
+                    # Post a click directly at the element position
+                    self._click_at(x, y)
+                    return {
+                        "success": True,
+                        "result": f"Clicked {target} at position ({x}, {y})",
+                    }
                 except Exception as e:
                     return {"success": False, "error": f"Click simulation failed: {e}"}
 
@@ -228,49 +418,54 @@ class ActionEngine:
             try:
                 # Find the application that contains this element
                 app = None
-                common_apps = [
-                    "Google Chrome",
-                    "Safari",
-                    "System Settings",
-                    "Calculator",
-                    "Cursor",
-                    "Visual Studio Code",
-                ]
+                # Resolve the owning app straight from the element's pid
+                hit = self._app_ref_for_element(element)
+                if not hit:
+                    # pid unavailable - fall back to probing the usual suspects
+                    common_apps = [
+                        "Google Chrome",
+                        "Safari",
+                        "System Settings",
+                        "Calculator",
+                        "Cursor",
+                        "Visual Studio Code",
+                    ]
 
-                for app_name in common_apps:
-                    try:
+                    def probe(app_name: str, found: threading.Event):
                         test_app = atomac.getAppRefByLocalizedName(app_name)
-                        if test_app:
-                            # Check if this element belongs to this app
-                            windows = [
-                                w
-                                for w in test_app.windows()
-                                if getattr(w, "AXRole", None) == "AXWindow"
-                            ]
-                            for window in windows:
-                                # Try to find this element in this window
-                                if self._element_in_window(element, window):
-                                    app = test_app
-                                    print(f"      🎯 Found app: {app_name}")
-                                    break
-                            if app:
-                                break
-                    except:
-                        continue
+                        if not test_app:
+                            return None
+                        # Check if this element belongs to this app
+                        windows = [
+                            w
+                            for w in test_app.windows()
+                            if getattr(w, "AXRole", None) == "AXWindow"
+                        ]
+                        for window in windows:
+                            if found.is_set():
+                                return None
+                            # Try to find this element in this window
+                            if self._element_in_window(element, window):
+                                return app_name, test_app
+                        return None
+
+                    hit = self._probe_apps(common_apps, probe)
+                if hit:
+                    app_name, app = hit
+                    self._log.debug("      🎯 Found app: %s", app_name)
 
                 if app:
-                    print(
-                        f"      🎯 Focusing app: {getattr(app, 'AXTitle', 'Unknown')}"
+                    self._log.debug(
+                        "      🎯 Focusing app: %s", getattr(app, "AXTitle", "Unknown")
                     )
                     app.activate()  # Focus the application
-                    time.sleep(1.0)  # Wait longer for focus
-
-                    # Double-check that the app is focused
-                    frontmost_app = atomac.getFrontmostApp()
-                    if frontmost_app and getattr(
-                        frontmost_app, "AXTitle", ""
-                    ) != getattr(app, "AXTitle", ""):
-                        print(f"      ⚠️  App focus failed, trying alternative method")
+                    self._el_cache.clear()
+
+                    # Wait until the app is actually frontmost
+                    if not self._wait_for_frontmost(app):
+                        self._log.debug(
+                            "      ⚠️  App focus failed, trying alternative method"
+                        )
                         # Try using osascript to focus the app
                         app_name = getattr(app, "AXTitle", "")
                         if app_name:
@@ -281,19 +476,19 @@ class ActionEngine:
                                     f'tell application "{app_name}" to activate',
                                 ]
                             )
-                            time.sleep(1.0)
+                            self._wait_for_frontmost(app)
                 else:
-                    print(
-                        f"      ⚠️  Could not find app for element, trying to focus anyway"
+                    self._log.debug(
+                        "      ⚠️  Could not find app for element, trying to focus anyway"
                     )
                     # Try to focus the element directly
             except Exception as e:
-                print(f"      ❌ App focus failed: {e}")
+                self._log.debug("      ❌ App focus failed: %s", e)
                 # Continue anyway - maybe the element click will work
 
             # Click the element to focus it
             try:
-                print(f"      🎯 Clicking element to focus it")
+                self._log.debug("      🎯 Clicking element to focus it")
 
                 # Try different methods to interact with the element
                 if hasattr(element, "AXPress"):
@@ -309,57 +504,32 @@ class ActionEngine:
                     if pos and size:
                         center_x = pos.x + size.width // 2
                         center_y = pos.y + size.height // 2
-                        print(
-                            f"      🎯 Using coordinate click at ({center_x}, {center_y})"
+                        self._log.debug(
+                            "      🎯 Using coordinate click at (%s, %s)", center_x, center_y
                         )
-                        subprocess.run(["cliclick", f"c:{center_x},{center_y}"])
+                        self._click_at(center_x, center_y)
                     else:
                         raise Exception("No suitable interaction method found")
 
-                time.sleep(1.0)  # Wait longer for focus
+                self._wait_until(lambda: getattr(element, "AXFocused", False))
             except Exception as e:
-                print(f"      ⚠️  Could not click element: {e}")
+                self._log.debug("      ⚠️  Could not click element: %s", e)
                 return {"success": False, "error": f"Could not focus element: {e}"}
 
             # Clear the field (select all and delete)
-            print(f"      🧹 Clearing field")
-            subprocess.run(
-                [
-                    "osascript",
-                    "-e",
-                    'tell application "System Events" to keystroke "a" using command down',
-                ]
-            )
-            time.sleep(0.3)
-            subprocess.run(
-                [
-                    "osascript",
-                    "-e",
-                    'tell application "System Events" to keystroke (ASCII character 127)',
-                ]
-            )
-            time.sleep(0.3)
+            self._log.debug("      🧹 Clearing field")
+            self._post_key(KEY_CODE_A, kCGEventFlagMaskCommand)
+            self._post_key(KEY_CODE_DELETE)
+            self._wait_until(lambda: not getattr(element, "AXValue", None), 0.3)
 
             # Type the text
-            print(f"      ⌨️  Typing: '{text}'")
-            subprocess.run(
-                [
-                    "osascript",
-                    "-e",
-                    f'tell application "System Events" to keystroke "{text}"',
-                ]
-            )
-            time.sleep(0.5)
+            self._log.debug("      ⌨️  Typing: '%s'", text)
+            self._type_text(text)
+            self._wait_for_value(element, text, 0.5)
 
             # Auto-press Enter for search completion (keystroke navigation)
-            print(f"      ⏎  Pressing Enter to complete search")
-            subprocess.run(
-                [
-                    "osascript",
-                    "-e",
-                    'tell application "System Events" to key code 36',  # Enter key
-                ]
-            )
+            self._log.debug("      ⏎  Pressing Enter to complete search")
+            self._post_key(KEY_CODE_RETURN)
             time.sleep(0.5)
 
             return {
@@ -390,17 +560,13 @@ class ActionEngine:
                     if pos and size:
                         center_x = pos.x + size.width // 2
                         center_y = pos.y + size.height // 2
-                        subprocess.run(["cliclick", f"c:{center_x},{center_y}"])
+                        self._click_at(center_x, center_y)
             except Exception as e:
-                print(f"      ⚠️  Could not focus element: {e}")
+                self._log.warning("      ⚠️  Could not focus element: %s", e)
             time.sleep(0.2)
 
-            # Press Enter key using system events
-            import subprocess
-
-            subprocess.run(
-                ["osascript", "-e", 'tell application "System Events" to key code 36']
-            )
+            # Press Enter key
+            self._post_key(KEY_CODE_RETURN)
             return {"success": True, "result": f"Pressed Enter on {target}"}
 
         except Exception as e:
@@ -425,7 +591,7 @@ class ActionEngine:
                     if pos and size:
                         center_x = pos.x + size.width // 2
                         center_y = pos.y + size.height // 2
-                        subprocess.run(["cliclick", f"c:{center_x},{center_y}"])
+                        self._click_at(center_x, center_y)
                 time.sleep(1.0)  # Wait for dropdown to appear
 
                 # Find and click the option
@@ -440,7 +606,7 @@ class ActionEngine:
                         if pos and size:
                             center_x = pos.x + size.width // 2
                             center_y = pos.y + size.height // 2
-                            subprocess.run(["cliclick", f"c:{center_x},{center_y}"])
+                            self._click_at(center_x, center_y)
                     time.sleep(0.5)
                     return {
                         "success": True,
@@ -497,27 +663,26 @@ class ActionEngine:
     def _execute_key(self, key: str) -> Dict[str, Any]:
         """Execute a keyboard key press"""
         try:
-            import subprocess
-
             # Map common keys to key codes
             key_map = {
-                "enter": "36",
-                "return": "36",
-                "space": "49",
-                "tab": "48",
-                "escape": "53",
-                "delete": "51",
-                "backspace": "51",
+                "enter": 36,
+                "return": 36,
+                "space": 49,
+                "tab": 48,
+                "escape": 53,
+                "delete": 51,
+                "backspace": 51,
             }
 
-            key_code = key_map.get(key.lower(), key)
-            subprocess.run(
-                [
-                    "osascript",
-                    "-e",
-                    f'tell application "System Events" to key code {key_code}',
-                ]
-            )
+            key_code = key_map.get(key.lower())
+            if key_code is None and key.isdigit():
+                key_code = int(key)
+
+            if key_code is not None:
+                self._post_key(key_code)
+            else:
+                # Not a known key name or raw key code - send it as a character
+                self._type_text(key)
             time.sleep(0.5)
 
             return {"success": True, "result": f"Pressed {key} key"}
@@ -527,15 +692,13 @@ class ActionEngine:
     def _execute_keystroke(self, target: str, text: str) -> Dict[str, Any]:
         """Execute keystroke navigation - type and press Enter automatically"""
         try:
-            import subprocess
-
             # Handle "all" target for terminal applications and System Settings search
             if target == "all":
                 # Check if this is an app launch command
                 if text.lower().startswith("open ") or text.lower().startswith(
                     "launch "
                 ):
-                    print(f"      🚀 App launch command: '{text}'")
+                    self._log.debug("      🚀 App launch command: '%s'", text)
                     try:
                         import subprocess
 
@@ -552,44 +715,20 @@ class ActionEngine:
                             "error": f"Failed to launch {app_name}: {e}",
                         }
 
-                print(f"      ⌨️  System-wide keystroke: '{text}' + Enter")
+                self._log.debug("      ⌨️  System-wide keystroke: '%s' + Enter", text)
 
                 # Clear any existing text (select all and delete)
-                subprocess.run(
-                    [
-                        "osascript",
-                        "-e",
-                        'tell application "System Events" to keystroke "a" using command down',
-                    ]
-                )
+                self._post_key(KEY_CODE_A, kCGEventFlagMaskCommand)
                 time.sleep(0.2)
-                subprocess.run(
-                    [
-                        "osascript",
-                        "-e",
-                        'tell application "System Events" to keystroke (ASCII character 127)',
-                    ]
-                )
+                self._post_key(KEY_CODE_DELETE)
                 time.sleep(0.2)
 
                 # Type the text
-                subprocess.run(
-                    [
-                        "osascript",
-                        "-e",
-                        f'tell application "System Events" to keystroke "{text}"',
-                    ]
-                )
+                self._type_text(text)
                 time.sleep(0.3)
 
                 # Press Enter to execute
-                subprocess.run(
-                    [
-                        "osascript",
-                        "-e",
-                        'tell application "System Events" to key code 36',
-                    ]
-                )
+                self._post_key(KEY_CODE_RETURN)
                 time.sleep(0.5)
 
                 return {
@@ -605,72 +744,55 @@ class ActionEngine:
             # Focus the application window
             try:
                 app = None
-                common_apps = [
-                    "Google Chrome",
-                    "Safari",
-                    "System Settings",
-                    "Calculator",
-                    "Cursor",
-                    "Visual Studio Code",
-                ]
+                hit = self._app_ref_for_element(element)
+                if hit:
+                    app = hit[1]
+                else:
+                    common_apps = [
+                        "Google Chrome",
+                        "Safari",
+                        "System Settings",
+                        "Calculator",
+                        "Cursor",
+                        "Visual Studio Code",
+                    ]
 
-                for app_name in common_apps:
-                    try:
+                    def probe(app_name: str, found: threading.Event):
                         test_app = atomac.getAppRefByLocalizedName(app_name)
                         if test_app and self._element_in_window(element, test_app):
-                            app = test_app
-                            break
-                    except:
-                        continue
+                            return test_app
+                        return None
+
+                    app = self._probe_apps(common_apps, probe)
 
                 if app:
                     app.activate()
-                    time.sleep(1.0)
+                    self._el_cache.clear()
+                    self._wait_for_frontmost(app)
             except Exception as e:
-                print(f"      ⚠️  App focus failed: {e}")
+                self._log.debug("      ⚠️  App focus failed: %s", e)
 
             # Click the element to focus it
             try:
                 element.AXPress()
-                time.sleep(0.5)
+                self._wait_until(lambda: getattr(element, "AXFocused", False), 0.5)
             except Exception as e:
-                print(f"      ⚠️  Could not click element: {e}")
+                self._log.debug("      ⚠️  Could not click element: %s", e)
 
             # Clear the field and type
-            print(f"      ⌨️  Keystroke navigation: '{text}' + Enter")
+            self._log.debug("      ⌨️  Keystroke navigation: '%s' + Enter", text)
 
             # Clear field
-            subprocess.run(
-                [
-                    "osascript",
-                    "-e",
-                    'tell application "System Events" to keystroke "a" using command down',
-                ]
-            )
-            time.sleep(0.2)
-            subprocess.run(
-                [
-                    "osascript",
-                    "-e",
-                    'tell application "System Events" to keystroke (ASCII character 127)',
-                ]
-            )
-            time.sleep(0.2)
+            self._post_key(KEY_CODE_A, kCGEventFlagMaskCommand)
+            self._post_key(KEY_CODE_DELETE)
+            self._wait_until(lambda: not getattr(element, "AXValue", None), 0.2)
 
             # Type the text
-            subprocess.run(
-                [
-                    "osascript",
-                    "-e",
-                    f'tell application "System Events" to keystroke "{text}"',
-                ]
-            )
-            time.sleep(0.3)
+            self._type_text(text)
+            self._wait_for_value(element, text, 0.3)
 
             # Press Enter to complete
-            subprocess.run(
-                ["osascript", "-e", 'tell application "System Events" to key code 36']
-            )
+            self._post_key(KEY_CODE_RETURN)
             time.sleep(0.5)
 
             return {
@@ -683,17 +805,9 @@ class ActionEngine:
     def _execute_press(self, target: str) -> Dict[str, Any]:
         """Execute a press action (for keys like 'enter')"""
         try:
-            import subprocess
-
             # Handle key presses
             if target.lower() in ["enter", "return"]:
-                subprocess.run(
-                    [
-                        "osascript",
-                        "-e",
-                        'tell application "System Events" to key code 36',
-                    ]
-                )
+                self._post_key(KEY_CODE_RETURN)
                 time.sleep(0.5)
                 return {"success": True, "result": f"Pressed {target} key"}
             else:
@@ -733,18 +847,10 @@ class ActionEngine:
             # Try mouse click simulation
             else:
                 try:
-                    import subprocess
-
                     pos = getattr(element, "AXPosition", None)
                     if pos:
-                        # Use osascript to click at the element position
-                        subprocess.run(
-                            [
-                                "osascript",
-                                "-e",
-                                f'tell application "System Events" to click at {{{pos.x}, {pos.y}}}',
-                            ]
-                        )
+                        # Post a click directly at the element position
+                        self._click_at(pos.x, pos.y)
                         return {
                             "success": True,
                             "result": f"Clicked {target} at position ({pos.x}, {pos.y})",
@@ -772,7 +878,7 @@ class ActionEngine:
 
             if not app:
                 # App not running, try to launch it
-                print(f"      🚀 Launching {app_name}...")
+                self._log.debug("      🚀 Launching %s...", app_name)
 
                 # Use system command as primary method
                 import subprocess
@@ -795,6 +901,7 @@ class ActionEngine:
             if app:
                 # Focus the app
                 app.activate()
+                self._el_cache.clear()
                 time.sleep(2)  # Wait for focus and UI to load
 
                 # Check if we have windows
@@ -817,6 +924,75 @@ class ActionEngine:
         except Exception as e:
             return {"success": False, "error": str(e)}
 
+    def _click_at(self, x: float, y: float) -> None:
+        """Post a left click at screen coordinates via Quartz (no subprocess)"""
+        point = (int(x), int(y))
+        down = CGEventCreateMouseEvent(
+            None, kCGEventLeftMouseDown, point, kCGMouseButtonLeft
+        )
+        up = CGEventCreateMouseEvent(None, kCGEventLeftMouseUp, point, kCGMouseButtonLeft)
+        CGEventPost(kCGHIDEventTap, down)
+        CGEventPost(kCGHIDEventTap, up)
+
+    def _post_key(self, key_code: int, flags: int = 0, chars: str = None) -> None:
+        """Post a key down/up pair via Quartz, optionally with modifiers or text"""
+        down = CGEventCreateKeyboardEvent(None, key_code, True)
+        up = CGEventCreateKeyboardEvent(None, key_code, False)
+        if flags:
+            CGEventSetFlags(down, flags)
+            CGEventSetFlags(up, flags)
+        if chars:
+            CGEventKeyboardSetUnicodeString(down, len(chars), chars)
+            CGEventKeyboardSetUnicodeString(up, len(chars), chars)
+        CGEventPost(kCGHIDEventTap, down)
+        CGEventPost(kCGHIDEventTap, up)
+
+    def _type_text(self, text: str) -> None:
+        """Type text by attaching it to keyboard events in small chunks"""
+        # Bind the Quartz calls once; this loop runs per chunk of long strings
+        create, set_chars, post = (
+            CGEventCreateKeyboardEvent,
+            CGEventKeyboardSetUnicodeString,
+            CGEventPost,
+        )
+        tap, step = kCGHIDEventTap, _UNICODE_CHUNK
+        for i in range(0, len(text), step):
+            chunk = text[i : i + step]
+            for key_down in (True, False):
+                event = create(None, 0, key_down)
+                set_chars(event, len(chunk), chunk)
+                post(tap, event)
+
+    @staticmethod
+    def _wait_until(
+        predicate: Callable[[], bool], timeout: float = 1.0, interval: float = 0.02
+    ) -> bool:
+        """Poll predicate until it holds or timeout expires; returns whether it held"""
+        monotonic, sleep = time.monotonic, time.sleep
+        end = monotonic() + timeout
+        while True:
+            try:
+                if predicate():
+                    return True
+            except Exception:
+                pass
+            if monotonic() >= end:
+                return False
+            sleep(interval)
+
+    def _wait_for_frontmost(self, app, timeout: float = 1.0) -> bool:
+        """Wait until app is the frontmost application"""
+        title = getattr(app, "AXTitle", "")
+        return self._wait_until(
+            lambda: getattr(atomac.getFrontmostApp(), "AXTitle", "") == title, timeout
+        )
+
+    def _wait_for_value(self, element, text: str, timeout: float) -> bool:
+        """Wait until a text element's AXValue reflects the typed text"""
+        return self._wait_until(
+            lambda: text in str(getattr(element, "AXValue", "") or ""), timeout
+        )
+
     def _get_bundle_id(self, app_name: str) -> str:
         """Get bundle ID for common apps"""
         bundle_ids = {
@@ -847,6 +1023,11 @@ class ActionEngine:
 
     def _find_element(self, target: str) -> Optional[Any]:
         """Find an element by ID or other identifier using position-based matching"""
+        now = time.monotonic()
+        hit = self._el_cache.get(target)
+        if hit and now - hit[0] < self._ELEMENT_TTL:
+            return hit[1]
+
         try:
             # Search in common apps where elements might be found
             common_apps = [
@@ -861,96 +1042,215 @@ class ActionEngine:
                 "Finder",
             ]
 
-            for app_name in common_apps:
-                try:
-                    app = atomac.getAppRefByLocalizedName(app_name)
-                    if app:
-                        windows = [
-                            w
-                            for w in app.windows()
-                            if getattr(w, "AXRole", None) == "AXWindow"
-                        ]
+            # Parse position-encoded IDs like "AXButton_533.0_310.0" once, up front
+            match = self._POS_ID_RE.match(target)
+            position_id = (
+                (match.group(1), float(match.group(2)), float(match.group(3)))
+                if match
+                else None
+            )
 
-                        for window in windows:
-                            # Try to find element by ID first (use findAllR for better compatibility)
-                            try:
-                                elements = window.findAllR(AXIdentifier=target)
-                                if elements:
-                                    return elements[0]
-                            except Exception as e:
-                                print(f"      ⚠️  AXIdentifier search failed: {e}")
-                                # Continue to other methods
-
-                            # Try to find by title
-                            try:
-                                elements = window.findAllR(AXTitle=target)
-                                if elements:
-                                    return elements[0]
-                            except Exception as e:
-                                print(f"      ⚠️  AXTitle search failed: {e}")
-                                # Continue to other methods
-
-                            # Fallback: Manual element scanning for identifier-based IDs
-                            try:
-                                all_elements = window.findAllR()
-                                for elem in all_elements:
-                                    try:
-                                        identifier = getattr(elem, "AXIdentifier", "")
-                                        if identifier == target:
-                                            return elem
-                                    except:
-                                        continue
-                            except Exception as e:
-                                print(f"      ⚠️  Manual element scan failed: {e}")
-
-                            # CRITICAL: Position-based element finding
-                            if "_" in target and target.count("_") >= 2:
-                                try:
-                                    # Parse position from ID like "AXButton_533.0_310.0"
-                                    parts = target.split("_")
-                                    if len(parts) >= 3:
-                                        role = parts[0]  # AXButton
-                                        x = float(parts[1])  # 533.0
-                                        y = float(parts[2])  # 310.0
-
-                                        # Find all elements of this role
-                                        elements = window.findAllR(AXRole=role)
-                                        for elem in elements:
-                                            pos = getattr(elem, "AXPosition", None)
-                                            if (
-                                                pos
-                                                and abs(pos.x - x) < 10
-                                                and abs(pos.y - y) < 10
-                                            ):
-                                                return elem
-                                except:
-                                    pass
-
-                            # Try to find by role and title
-                            if "button" in target.lower():
-                                element = window.findFirst(
-                                    AXRole="AXButton", AXTitle=target
-                                )
-                                if element:
-                                    return element
-                except Exception:
-                    continue
+            # Only probe apps that are actually running
+            self._refresh_running_apps()
+            running_apps = [name for name in common_apps if name in self._pid_by_name]
 
+            element = self._probe_apps(
+                running_apps,
+                lambda app_name, found: self._find_element_in_app(
+                    app_name, target, position_id, found
+                ),
+            )
+            if element is not None:
+                self._el_cache[target] = (now, element)
+            return element
+
+        except Exception as e:
+            self._log.warning("      ⚠️  Error finding element %s: %s", target, e)
             return None
 
+    def _find_element_in_app(
+        self,
+        app_name: str,
+        target: str,
+        position_id: Optional[tuple],
+        found: threading.Event,
+    ) -> Optional[Any]:
+        """Search one app's windows for target; bails out once another probe has a hit"""
+        app = self._running_app_ref(app_name)
+        if not app:
+            return None
+
+        windows = [w for w in app.windows() if getattr(w, "AXRole", None) == "AXWindow"]
+
+        for window in windows:
+            if found.is_set():
+                return None
+
+            # One tree walk per window; every lookup below scans the cached columns
+            try:
+                snapshot = self._snapshot_window(window)
+            except Exception as e:
+                self._log.warning("      ⚠️  Element snapshot failed: %s", e)
+                continue
+            refs = snapshot["refs"]
+
+            # Try to find element by ID first
+            for i, identifier in enumerate(snapshot["identifiers"]):
+                if identifier == target:
+                    return refs[i]
+
+            # Try to find by title
+            for i, title in enumerate(snapshot["titles"]):
+                if title == target:
+                    return refs[i]
+
+            # CRITICAL: Position-based element finding
+            if position_id is not None:
+                role, x, y = position_id
+                roles = snapshot["roles"]
+                xs = snapshot["xs"]
+                ys = snapshot["ys"]
+                for i in range(len(refs)):
+                    if (
+                        roles[i] == role
+                        and xs[i] is not None
+                        and abs(xs[i] - x) < 10
+                        and abs(ys[i] - y) < 10
+                    ):
+                        return refs[i]
+
+        return None
+
+    def _snapshot_window(self, window: Any) -> Dict[str, list]:
+        """
+        Walk a window's element tree once and read the attributes used for lookup.
+
+        Returns parallel lists (refs, identifiers, titles, roles, xs, ys) so repeated
+        searches index plain Python lists instead of issuing an AX call per attribute.
+        Snapshots are reused for _SNAPSHOT_TTL seconds.
+        """
+        key = window.ref
+        now = time.monotonic()
+        with self._snapshot_lock:
+            cached = self._window_snapshots.get(key)
+        if cached and now - cached[0] < self._SNAPSHOT_TTL:
+            return cached[1]
+
+        snapshot = {
+            "refs": [],
+            "identifiers": [],
+            "titles": [],
+            "roles": [],
+            "xs": [],
+            "ys": [],
+        }
+        for elem in window.findAllR():
+            try:
+                pos = getattr(elem, "AXPosition", None)
+                snapshot["refs"].append(elem)
+                snapshot["identifiers"].append(getattr(elem, "AXIdentifier", None))
+                snapshot["titles"].append(getattr(elem, "AXTitle", None))
+                snapshot["roles"].append(getattr(elem, "AXRole", None))
+                snapshot["xs"].append(pos.x if pos else None)
+                snapshot["ys"].append(pos.y if pos else None)
+            except Exception:
+                continue
+
+        # Drop expired snapshots so a long-lived engine (the bridge) doesn't keep
+        # every window it has ever searched. Probe workers share this dict.
+        snapshots, ttl = self._window_snapshots, self._SNAPSHOT_TTL
+        with self._snapshot_lock:
+            for stale, (taken_at, _) in list(snapshots.items()):
+                if now - taken_at >= ttl:
+                    snapshots.pop(stale, None)
+            snapshots[key] = (now, snapshot)
+        return snapshot
+
+    def _refresh_running_apps(self) -> None:
+        """Rebuild the pid/name tables of running applications from NSWorkspace"""
+        try:
+            running = NSWorkspace.sharedWorkspace().runningApplications()
+            self._running_by_pid = {app.processIdentifier(): app for app in running}
+            self._pid_by_name = {
+                app.localizedName(): pid
+                for pid, app in self._running_by_pid.items()
+                if app.localizedName()
+            }
         except Exception as e:
-            print(f"      ⚠️  Error finding element {target}: {e}")
+            self._log.warning("      ⚠️  Could not list running apps: %s", e)
+
+    def _running_app_ref(self, app_name: str) -> Optional[Any]:
+        """Get an atomac app reference for a running app by name via the pid table"""
+        pid = self._pid_by_name.get(app_name)
+        if pid is None:
+            return None
+        return atomac.getAppRefByPid(pid)
+
+    def _element_pid(self, element: Any) -> Optional[int]:
+        """Get the pid of the process that owns an AX element"""
+        try:
+            err, pid = AXUIElementGetPid(element.ref, None)
+            return pid if err == 0 else None
+        except Exception:
             return None
 
+    def _app_ref_for_element(self, element: Any) -> Optional[tuple]:
+        """Resolve (app_name, app_ref) for the app owning element, or None"""
+        pid = self._element_pid(element)
+        if pid is None:
+            return None
+
+        running_app = self._running_by_pid.get(pid)
+        if running_app is None:
+            # App launched since the table was built
+            self._refresh_running_apps()
+            running_app = self._running_by_pid.get(pid)
+            if running_app is None:
+                return None
+
+        return running_app.localizedName(), atomac.getAppRefByPid(pid)
+
+    def _probe_apps(
+        self, app_names: List[str], probe: Callable[[str, threading.Event], Any]
+    ) -> Optional[Any]:
+        """
+        Run probe(app_name, found) for each app on the probe pool.
+
+        Results are taken in app_names (priority) order, so a lower-priority hit
+        never wins over a higher-priority app. `found` is set only once every
+        earlier probe came back empty, and any probes not yet started are cancelled.
+        """
+        found = threading.Event()
+        futures = [_PROBE_POOL.submit(probe, name, found) for name in app_names]
+        try:
+            for future in futures:
+                try:
+                    result = future.result()
+                except Exception:
+                    continue
+                if result is not None:
+                    found.set()
+                    return result
+            return None
+        finally:
+            for future in futures:
+                future.cancel()
+
     def _element_in_window(self, element: Any, window: Any) -> bool:
         """Check if an element belongs to a specific window"""
         try:
-            # Get all elements in the window and check if our element is among them
-            all_elements = window.findAllR()
-            for elem in all_elements:
-                if elem == element:
+            # Climb the AXParent chain instead of walking the whole window tree
+            current = element
+            for _ in range(64):
+                if current == window:
                     return True
-            return False
+                parent = getattr(current, "AXParent", None)
+                if parent is None:
+                    break
+                current = parent
+
+            # Parent chain unavailable or exhausted - compare the top-level element once
+            return getattr(element, "AXTopLevelUIElement", None) == window
         except:
             return False
 
@@ -976,29 +1276,92 @@ class ActionEngine:
             return None
 
         except Exception as e:
-            print(f"      ⚠️  Error finding option {option}: {e}")
+            self._log.warning("      ⚠️  Error finding option %s: %s", option, e)
             return None
 
     def execute_action_sequence(
         self, actions: List[Dict[str, Any]]
     ) -> List[Dict[str, Any]]:
         """Execute a sequence of actions"""
+        # Strictly one at a time: clicks can fall back to global CGEvents and
+        # selects open modal menus, so no two actions may overlap
         results = []
 
         for i, action in enumerate(actions):
-            print(f"   📋 Executing action {i+1}/{len(actions)}")
+            # Subscribe before acting so a change posted mid-action isn't missed
+            watch = self._observe_ui_changes() if i < len(actions) - 1 else None
+
+            self._log.debug("   📋 Executing action %s/%s", i + 1, len(actions))
             result = self.execute_action(action)
             results.append(result)
 
             # If action failed, decide whether to continue
             if not result.get("success", False):
-                print(f"   ⚠️  Action {i+1} failed, continuing with next action")
+                self._log.warning(
+                    "   ⚠️  Action %s failed, continuing with next action", i + 1
+                )
 
-            # Small delay between actions
-            time.sleep(0.5)
+            # Move on once the UI reports a change; the last action keeps a fixed settle
+            if watch is None:
+                time.sleep(0.5)
+            else:
+                self._wait_for_ui_change(watch, timeout=0.5)
 
         return results
 
+    def _observe_ui_changes(self) -> Optional[tuple]:
+        """Subscribe to value/layout changes in the frontmost app on this thread's run loop"""
+        try:
+            app = NSWorkspace.sharedWorkspace().frontmostApplication()
+            pid = app.processIdentifier()
+            err, observer = AXObserverCreate(pid, self._on_ui_change, None)
+            if err != 0 or observer is None:
+                return None
+
+            app_element = AXUIElementCreateApplication(pid)
+            subscribed = [
+                notification
+                for notification in (
+                    kAXValueChangedNotification,
+                    kAXLayoutChangedNotification,
+                )
+                if AXObserverAddNotification(observer, app_element, notification, None)
+                == 0
+            ]
+            if not subscribed:
+                return None
+
+            source = AXObserverGetRunLoopSource(observer)
+            run_loop = CFRunLoopGetCurrent()
+            CFRunLoopAddSource(run_loop, source, kCFRunLoopDefaultMode)
+            return observer, source, run_loop
+        except Exception as e:
+            self._log.debug("      ⚠️  Could not observe UI changes: %s", e)
+            return None
+
+    def _wait_for_ui_change(self, watch: tuple, timeout: float) -> bool:
+        """Run the run loop until an observed notification arrives or timeout
+
+        True only if a notification was handled; a timeout (or a failed wait,
+        which sleeps out the timeout instead) returns False.
+        """
+        observer, source, run_loop = watch
+        try:
+            # Returns as soon as the observer's source has handled a notification;
+            # a timeout comes back as kCFRunLoopRunTimedOut
+            result = CFRunLoopRunInMode(kCFRunLoopDefaultMode, timeout, True)
+            return result == kCFRunLoopRunHandledSource
+        except Exception as e:
+            self._log.debug("      ⚠️  Waiting for UI change failed: %s", e)
+            time.sleep(timeout)
+            return False
+        finally:
+            CFRunLoopRemoveSource(run_loop, source, kCFRunLoopDefaultMode)
+
+    @staticmethod
+    def _on_ui_change(observer, element, notification, refcon) -> None:
+        """AX observer callback; handling it is what wakes the waiting run loop"""
+
     def validate_action(self, action: Dict[str, Any]) -> bool:
         """Validate that an action can be executed"""
         action_type = action.get("action", "").lower()
@@ -1014,26 +1377,15 @@ class ActionEngine:
             return False
 
         # Check if action is supported for this element type
-        element_role = getattr(element, "AXRole", None)
-
-        if action_type == "click":
-            return element_role in [
-                "AXButton",
-                "AXPopUpButton",
-                "AXCheckBox",
-                "AXRadioButton",
-            ]
-        elif action_type == "type":
-            return element_role in ["AXTextField", "AXTextArea"]
-        elif action_type == "select":
-            return element_role in ["AXPopUpButton", "AXComboBox"]
-
-        return True
+        verbs = _VERBS.get(action_type)
+        return verbs is None or getattr(element, "AXRole", None) in verbs
 
     def get_action_summary(self) -> Dict[str, Any]:
         """Get a summary of action capabilities"""
-        successful_actions = sum(1 for action in self.action_history if action.success)
-        total_actions = len(self.action_history)
+        with self._history_lock:
+            total_actions = self._n_total
+            successful_actions = self._n_ok
+            action_types = list(self._types)
 
         return {
             "total_actions": total_actions,
@@ -1041,77 +1393,136 @@ class ActionEngine:
             "success_rate": (
                 successful_actions / total_actions if total_actions > 0 else 0
             ),
-            "action_types": list(set(action.action for action in self.action_history)),
+            "action_types": action_types,
         }
 
     def _crop_element_region(
         self,
-        screenshot_path: str,
+        screenshot: Union[str, np.ndarray, Image.Image],
         element_position: tuple,
         element_size: tuple,
         padding: int = 20,
-    ) -> Image.Image:
+    ) -> Optional[Union[np.ndarray, Image.Image]]:
         """
         Crop screenshot to the region around an element.
 
         Args:
-            screenshot_path: Path to the screenshot
-            element_position: (x, y) position of element
-            element_size: (width, height) size of element
+            screenshot: RGB array from CoreGraphics, PIL Image, or path to an image file
+            element_position: (x, y) position of element in screen points
+            element_size: (width, height) size of element in screen points
             padding: Extra pixels around element
 
         Returns:
-            Cropped PIL Image
+            Zero-copy array view for array input, otherwise a cropped PIL Image
         """
         try:
-            img = Image.open(screenshot_path)
             x, y = element_position
             width, height = element_size
 
+            if isinstance(screenshot, str):
+                screenshot = Image.open(screenshot)
+
+            if isinstance(screenshot, np.ndarray):
+                # Retina captures have more pixels than points
+                scale = self._screen_scale
+                img_height, img_width = screenshot.shape[:2]
+            else:
+                scale = 1.0
+                img_width, img_height = screenshot.size
+
             # Calculate crop box with padding
-            left = max(0, int(x - padding))
-            top = max(0, int(y - padding))
-            right = min(img.width, int(x + width + padding))
-            bottom = min(img.height, int(y + height + padding))
+            left = max(0, int((x - padding) * scale))
+            top = max(0, int((y - padding) * scale))
+            right = min(img_width, int((x + width + padding) * scale))
+            bottom = min(img_height, int((y + height + padding) * scale))
 
-            cropped = img.crop((left, top, right, bottom))
+            if isinstance(screenshot, np.ndarray):
+                # A view into the capture; nothing is copied
+                return screenshot[top:bottom, left:right]
+
+            cropped = screenshot.crop((left, top, right, bottom))
             return cropped
         except Exception as e:
-            print(f"      ⚠️  Error cropping image: {e}")
+            self._log.warning("      ⚠️  Error cropping image: %s", e)
             return None
 
     def _compare_images(
-        self, img1: Image.Image, img2: Image.Image, threshold: float = 0.05
+        self,
+        img1: Union[np.ndarray, Image.Image],
+        img2: Union[np.ndarray, Image.Image],
+        threshold: float = _CHANGE_THRESHOLD,
     ) -> Dict[str, Any]:
         """
         Compare two images to detect visual changes.
 
+        Both crops are first reduced to 64x64 grayscale. A negligible mean intensity
+        delta means no change; anything else gets the full-resolution changed-pixel
+        count, since a mean delta can't account for _PIXEL_DIFF_TOLERANCE.
+
         Args:
-            img1: First image (before action)
-            img2: Second image (after action)
+            img1: First image (before action), RGB array or PIL Image
+            img2: Second image (after action), RGB array or PIL Image
             threshold: Percentage of pixels that must differ (0.0-1.0)
 
         Returns:
             Dict with comparison results
         """
         try:
-            # Ensure images are same size
-            if img1.size != img2.size:
-                img2 = img2.resize(img1.size)
+            # Get pixel data as C-contiguous uint8 RGB arrays for the diff kernel
+            pixels1 = self._rgb_pixels(img1)
+            pixels2 = self._rgb_pixels(img2)
+
+            # Ensure images are same size; a real size change is itself a change
+            if pixels1.shape != pixels2.shape:
+                height, width = pixels1.shape[:2]
+                if (
+                    abs(height - pixels2.shape[0]) > 1
+                    or abs(width - pixels2.shape[1]) > 1
+                ):
+                    return {"changed": True, "difference_percentage": 1.0}
+                pixels2 = np.asarray(
+                    Image.fromarray(pixels2).resize((width, height)), dtype=np.uint8
+                )
 
-            # Convert to RGB if needed
-            if img1.mode != "RGB":
-                img1 = img1.convert("RGB")
-            if img2.mode != "RGB":
-                img2 = img2.convert("RGB")
+            total_pixels = pixels1.shape[0] * pixels1.shape[1]
+            unchanged = {
+                "changed": False,
+                "difference_percentage": 0.0,
+                "different_pixels": 0,
+                "total_pixels": total_pixels,
+            }
 
-            # Get pixel data
-            pixels1 = list(img1.getdata())
-            pixels2 = list(img2.getdata())
+            # Identical buffers (the usual missed-click case): one sequential compare
+            if np.array_equal(pixels1, pixels2):
+                return unchanged
 
-            # Count different pixels
-            total_pixels = len(pixels1)
-            different_pixels = sum(1 for p1, p2 in zip(pixels1, pixels2) if p1 != p2)
+            # Cheap pre-check on small grayscale thumbnails
+            thumb1 = np.asarray(
+                Image.fromarray(pixels1)
+                .convert("L")
+                .resize(self._DIFF_THUMB_SIZE, Image.BILINEAR),
+                dtype=np.int16,
+            )
+            thumb2 = np.asarray(
+                Image.fromarray(pixels2)
+                .convert("L")
+                .resize(self._DIFF_THUMB_SIZE, Image.BILINEAR),
+                dtype=np.int16,
+            )
+            intensity_delta = float(np.abs(thumb1 - thumb2).mean())
+            if intensity_delta < self._DIFF_THUMB_EPSILON:
+                return unchanged
+
+            # Count different pixels, only diffing bands that aren't byte-identical
+            different_pixels = 0
+            for start in range(0, pixels1.shape[0], self._DIFF_BAND_ROWS):
+                band1 = pixels1[start : start + self._DIFF_BAND_ROWS]
+                band2 = pixels2[start : start + self._DIFF_BAND_ROWS]
+                if np.array_equal(band1, band2):
+                    continue
+                different_pixels += int(
+                    _count_diff_pixels(band1, band2, self._PIXEL_DIFF_TOLERANCE)
+                )
 
             difference_percentage = different_pixels / total_pixels
             changed = difference_percentage > threshold
@@ -1123,11 +1534,106 @@ class ActionEngine:
                 "total_pixels": total_pixels,
             }
         except Exception as e:
-            print(f"      ⚠️  Error comparing images: {e}")
+            self._log.warning("      ⚠️  Error comparing images: %s", e)
             return {"changed": False, "error": str(e)}
 
+    @staticmethod
+    def _rgb_pixels(img: Union[np.ndarray, Image.Image]) -> np.ndarray:
+        """Normalize a crop to a C-contiguous uint8 RGB array"""
+        if isinstance(img, Image.Image):
+            if img.mode != "RGB":
+                img = img.convert("RGB")
+            return np.asarray(img, dtype=np.uint8)
+        return np.ascontiguousarray(img[:, :, :3], dtype=np.uint8)
+
+    @staticmethod
+    def _window_list_image(rect) -> Optional[np.ndarray]:
+        """Capture a screen rect (in points) into an RGB array via CoreGraphics"""
+        image_ref = CGWindowListCreateImage(
+            rect,
+            kCGWindowListOptionOnScreenOnly,
+            kCGNullWindowID,
+            kCGWindowImageDefault,
+        )
+        if image_ref is None:
+            return None
+
+        width = CGImageGetWidth(image_ref)
+        height = CGImageGetHeight(image_ref)
+        bytes_per_row = CGImageGetBytesPerRow(image_ref)
+        data = CGDataProviderCopyData(CGImageGetDataProvider(image_ref))
+
+        # Rows may be padded past width * 4; view as BGRA and drop the padding
+        bgra = np.frombuffer(data, dtype=np.uint8).reshape(height, bytes_per_row)
+        bgra = bgra[:, : width * 4].reshape(height, width, 4)
+        return bgra[:, :, 2::-1]  # BGR(A) -> RGB view, no copy
+
+    def _capture_screen_array(self) -> Optional[np.ndarray]:
+        """Grab the main display straight into an RGB array via CoreGraphics"""
+        try:
+            bounds = CGDisplayBounds(CGMainDisplayID())
+            rgb = self._window_list_image(bounds)
+            if rgb is None:
+                return None
+
+            self._screen_scale = rgb.shape[1] / bounds.size.width
+            return rgb
+        except Exception as e:
+            self._log.warning("      ⚠️  In-memory screen capture failed: %s", e)
+            return None
+
+    def _grab_region(
+        self, x: float, y: float, w: float, h: float, padding: int = 20
+    ) -> Optional[np.ndarray]:
+        """Capture just the padded element rect, without a full-screen grab"""
+        try:
+            rect = CGRectMake(x - padding, y - padding, w + 2 * padding, h + 2 * padding)
+            rgb = self._window_list_image(rect)
+            if rgb is None or rgb.size == 0:
+                return None
+            return rgb
+        except Exception as e:
+            self._log.warning("      ⚠️  Region capture failed: %s", e)
+            return None
+
+    def _capture_element_region(
+        self, target_app: str, element_position: tuple, element_size: tuple
+    ) -> Optional[Union[np.ndarray, Image.Image]]:
+        """Capture the area around an element, preferring a direct region grab"""
+        region = self._grab_region(*element_position, *element_size)
+        if region is not None:
+            return region
+
+        # Fall back to a full capture and crop it down
+        screenshot = self._capture_screenshot(target_app)
+        if screenshot is None:
+            return None
+        return self._crop_element_region(screenshot, element_position, element_size)
+
+    def _capture_screenshot(
+        self, target_app: str
+    ) -> Optional[Union[np.ndarray, Image.Image]]:
+        """Capture the screen in memory, falling back to the VLM window capture"""
+        now = time.monotonic()
+        hit = self._ss_cache.get(target_app)
+        if hit and now - hit[0] < self._SCREENSHOT_TTL:
+            return hit[1]
+
+        screenshot = self._capture_screen_array()
+        if screenshot is None:
+            # Use the analyzer's image as-is when it hands one back instead of a path
+            captured = self.vlm.capture_screenshot(target_app)
+            if captured is None or isinstance(captured, Image.Image):
+                screenshot = captured
+            elif captured:
+                screenshot = Image.open(captured)
+
+        if screenshot is not None:
+            self._ss_cache[target_app] = (now, screenshot)
+        return screenshot
+
     def capture_before_screenshot(
-        self, element_id: str, target_app: str = "System Settings"
+        self, element_id: str, target_app: str = "System Settings", element=None
     ) -> Dict[str, Any]:
         """
         Capture screenshot before action for later comparison.
@@ -1135,13 +1641,19 @@ class ActionEngine:
         Args:
             element_id: ID of the element
             target_app: Target application name
+            element: Already-resolved element, to skip a second lookup
 
         Returns:
             Dict with before state data
         """
+        # Nothing will consume the screenshot, so don't take one
+        if not self.visual_verification_enabled:
+            return {"success": False, "reason": "Visual verification disabled"}
+
         try:
             # Find the element to get its position and size
-            element = self._find_element(element_id)
+            if element is None:
+                element = self._find_element(element_id)
             if not element:
                 return {"success": False, "reason": "Element not found"}
 
@@ -1154,35 +1666,95 @@ class ActionEngine:
             element_position = (pos.x, pos.y)
             element_size = (size.width, size.height)
 
-            # Take screenshot
-            from model.gemini import VLMAnalyzer
-
-            vlm = VLMAnalyzer()
-
-            screenshot = vlm.capture_screenshot(target_app)
-            if not screenshot:
-                return {"success": False, "reason": "Screenshot failed"}
-
-            # Crop to element region
-            cropped = self._crop_element_region(
-                screenshot, element_position, element_size
+            # Capture just the element region
+            cropped = self._capture_element_region(
+                target_app, element_position, element_size
             )
-            if not cropped:
-                return {"success": False, "reason": "Crop failed"}
-
-            # Save for debugging
-            cropped.save("before_action_crop.png")
-            print(f"      💾 Saved before_action_crop.png")
+            if cropped is None:
+                return {"success": False, "reason": "Screenshot failed"}
 
+            # Keep the crop in memory; it is only written out if verification fails
             return {
                 "success": True,
-                "cropped_image": cropped,
+                "image": cropped,
                 "position": element_position,
                 "size": element_size,
             }
         except Exception as e:
             return {"success": False, "reason": f"Error: {e}"}
 
+    def _capture_settled_region(
+        self,
+        target_app: str,
+        element_position: tuple,
+        element_size: tuple,
+        before_crop: Union[np.ndarray, Image.Image],
+    ) -> tuple:
+        """
+        Poll the element region until it has changed and stopped moving.
+
+        Returns:
+            (last crop, its comparison against before_crop); crop is None if capture failed
+        """
+        deadline = time.monotonic() + self._SETTLE_TIMEOUT
+        previous = None
+        for _ in range(self._SETTLE_MAX_POLLS):
+            time.sleep(self._SETTLE_INTERVAL)
+
+            # Every poll needs a fresh frame, not the memoized one
+            self._ss_cache.pop(target_app, None)
+            crop = self._capture_element_region(
+                target_app, element_position, element_size
+            )
+            if crop is None:
+                break
+
+            # Distance from the before state and from the last poll, in one pass
+            if previous is None:
+                moved = self._compare_images_batch([before_crop], [crop])
+            else:
+                moved = self._compare_images_batch(
+                    [before_crop, previous], [crop, crop]
+                )
+
+            previous = crop
+            if len(moved) > 1 and (
+                moved[0] > self._CHANGE_THRESHOLD and moved[1] < self._SETTLE_EPSILON
+            ):
+                break
+            if time.monotonic() >= deadline:
+                break
+
+        if previous is None:
+            return None, None
+        return previous, self._compare_images(before_crop, previous)
+
+    def _compare_images_batch(
+        self,
+        befores: List[Union[np.ndarray, Image.Image]],
+        afters: List[Union[np.ndarray, Image.Image]],
+    ) -> np.ndarray:
+        """Changed-pixel fraction for each before/after pair, stacked into one pass"""
+        pairs = [
+            (self._rgb_pixels(before), self._rgb_pixels(after))
+            for before, after in zip(befores, afters)
+        ]
+        height = max(max(b.shape[0], a.shape[0]) for b, a in pairs)
+        width = max(max(b.shape[1], a.shape[1]) for b, a in pairs)
+
+        # Zero-pad to a common (N, H, W, 3); padding on both sides matches itself
+        before_stack = np.zeros((len(pairs), height, width, 3), dtype=np.int16)
+        after_stack = np.zeros_like(before_stack)
+        for i, (before, after) in enumerate(pairs):
+            before_stack[i, : before.shape[0], : before.shape[1]] = before
+            after_stack[i, : after.shape[0], : after.shape[1]] = after
+
+        changed = (
+            np.abs(before_stack - after_stack).sum(axis=-1) > self._PIXEL_DIFF_TOLERANCE
+        )
+        areas = np.array([b.shape[0] * b.shape[1] for b, _ in pairs], dtype=np.float64)
+        return changed.sum(axis=(1, 2)) / areas
+
     def verify_action_visually(
         self,
         element_id: str,
@@ -1201,45 +1773,30 @@ class ActionEngine:
             Dict with verification results
         """
         try:
-            print(f"      🔍 Visually verifying action on {element_id}")
+            self._log.debug("      🔍 Visually verifying action on %s", element_id)
+
+            # Anything captured before the action is stale by definition
+            self._ss_cache.clear()
 
             if not before_state.get("success"):
                 return {"verified": False, "reason": "No before state"}
 
-            before_crop = before_state["cropped_image"]
+            before_crop = before_state["image"]
             element_position = before_state["position"]
             element_size = before_state["size"]
 
-            # Wait a moment for action to complete
-            time.sleep(0.5)
-
-            # Take screenshot after action
-            from model.gemini import VLMAnalyzer
-
-            vlm = VLMAnalyzer()
-
-            after_screenshot = vlm.capture_screenshot(target_app)
-            if not after_screenshot:
-                print(f"      ⚠️  Could not capture after screenshot")
-                return {"verified": False, "reason": "Screenshot failed"}
-
-            # Crop to same region
-            after_crop = self._crop_element_region(
-                after_screenshot, element_position, element_size
+            # Capture the same region once it has settled after the action
+            after_crop, comparison = self._capture_settled_region(
+                target_app, element_position, element_size, before_crop
             )
-            if not after_crop:
-                return {"verified": False, "reason": "Crop failed"}
-
-            # Save cropped image for debugging
-            after_crop.save("after_action_crop.png")
-            print(f"      💾 Saved after_action_crop.png")
-
-            # Compare images
-            comparison = self._compare_images(before_crop, after_crop)
+            if after_crop is None:
+                self._log.warning("      ⚠️  Could not capture after screenshot")
+                return {"verified": False, "reason": "Screenshot failed"}
 
             if comparison.get("changed"):
-                print(
-                    f"      ✅ Visual change detected: {comparison['difference_percentage']:.2%} pixels changed"
+                self._log.debug(
+                    "      ✅ Visual change detected: %.2f%% pixels changed",
+                    comparison["difference_percentage"] * 100,
                 )
                 return {
                     "verified": True,
@@ -1247,9 +1804,17 @@ class ActionEngine:
                     "comparison": comparison,
                 }
             else:
-                print(
-                    f"      ❌ No visual change detected: {comparison['difference_percentage']:.2%} pixels changed"
+                self._log.debug(
+                    "      ❌ No visual change detected: %.2f%% pixels changed",
+                    comparison["difference_percentage"] * 100,
                 )
+                # Dump raw crops for debugging only on request (no PNG deflate)
+                if os.getenv("HH_DEBUG_CROPS"):
+                    np.save("before_action_crop.npy", np.asarray(before_crop))
+                    np.save("after_action_crop.npy", np.asarray(after_crop))
+                    self._log.debug(
+                        "      💾 Saved before_action_crop.npy / after_action_crop.npy"
+                    )
                 return {
                     "verified": False,
                     "reason": "No visual change detected",
@@ -1257,5 +1822,5 @@ class ActionEngine:
                 }
 
         except Exception as e:
-            print(f"      ❌ Visual verification error: {e}")
+            self._log.warning("      ❌ Visual verification error: %s", e)
             return {"verified": False, "reason": f"Error: {e}"}
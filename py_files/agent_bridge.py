@@ -1,29 +1,102 @@
 # agent_bridge.py
 #!/usr/bin/env python3
-import sys, json, traceback, os
-from agent_core import AgentCore
+import sys, json, traceback, os, io, threading, struct
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+    _ORJSON_OPTS = (
+        orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE
+    )
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# json.dumps(default=...) builds a fresh encoder per call; build the fallback one once
+_enc = json.JSONEncoder(default=str, separators=(",", ":"))
+
+# Events are coalesced here and hit the pipe in as few writes as possible.
+# main() hands sys.stdout over to stderr, so only this writer touches the pipe
+_pipe = sys.stdout.buffer
+_out = io.BufferedWriter(_pipe, 64 * 1024)
+_out_lock = threading.Lock()
+_flush_timer = None
+STEP_FLUSH_DELAY = 0.05  # max seconds a step event waits in the buffer
+
+def _flush():
+    global _flush_timer
+    with _out_lock:
+        _flush_timer = None
+        _out.flush()
+        _pipe.flush()
+
+def _encode(obj) -> bytes:
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=str, option=_ORJSON_OPTS)
+    return (_enc.encode(obj) + "\n").encode()
+
+def _write(obj):
+    data = _encode(obj)
+    with _out_lock:
+        _out.write(data)
 
 def send(obj):
-    sys.stdout.write(json.dumps(obj, default=str) + "\n")
-    sys.stdout.flush()
+    _write(obj)
+    _flush()
+
+def send_buffered(obj):
+    # Step bursts share one write; a short timer keeps the UI narration live
+    global _flush_timer
+    _write(obj)
+    with _out_lock:
+        if _flush_timer is None:
+            _flush_timer = threading.Timer(STEP_FLUSH_DELAY, _flush)
+            _flush_timer.daemon = True
+            _flush_timer.start()
 
 def bridge_emit(payload: dict):
     # Everything the agent emits as a "step" comes through here
     # You can enrich/add timestamps if you want
-    send({"event": "step", **payload})
+    send_buffered({"event": "step", **payload})
+
+def _read_messages(stream):
+    # Frames are a 4-byte big-endian length + JSON payload; a leading "{" means plain JSON lines
+    first = stream.peek(1)[:1]
+    if not first:
+        return
+    if first in b"{ \t\r\n":
+        for raw in stream:
+            raw = raw.strip()
+            if raw:
+                yield raw
+        return
+    while True:
+        hdr = stream.read(4)
+        if len(hdr) < 4:
+            return
+        (n,) = struct.unpack(">I", hdr)
+        payload = stream.read(n)
+        if len(payload) < n:
+            return
+        yield payload
+
+def _decode(raw: bytes):
+    return orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
 
 def main():
+    # Stray agent prints would otherwise split our JSON lines mid-write
+    sys.stdout.flush()
+    sys.stdout = sys.stderr
+
     send({"event":"bridge_ready", "pid": os.getpid()})
 
-    # 👇 pass the bridge emitter into the agent
-    agent = AgentCore(event_cb=bridge_emit)
+    # The agent stack (Gemini, PyObjC, numpy...) is imported on the first run_goal,
+    # so bridge_ready and ping don't wait on it
+    agent = None
 
-    for raw in sys.stdin:
-        raw = raw.strip()
-        if not raw:
-            continue
+    for raw in _read_messages(sys.stdin.buffer):
+        req_id = None
         try:
-            msg = json.loads(raw)
+            msg = _decode(raw)
             op = msg.get("op")
             req_id = msg.get("id")
 
@@ -35,6 +108,10 @@ def main():
                 goal = msg.get("goal") or ""
                 target = msg.get("target_app")
                 max_iter = int(msg.get("max_iterations", 5))
+                if agent is None:
+                    from agent_core import AgentCore
+                    # 👇 pass the bridge emitter into the agent
+                    agent = AgentCore(event_cb=bridge_emit)
                 send({"event":"started", "id": req_id, "goal": goal, "target_app": target})
                 result = agent.run_autonomous_loop(goal=goal, target_app=target, max_iterations=max_iter)
                 send({"event":"finished", "id": req_id, "result": result})
@@ -47,7 +124,8 @@ def main():
             send({"event":"error", "id": req_id, "error": f"Unknown op: {op}"})
 
         except Exception as e:
-            send({"event":"error","error": str(e),"trace": traceback.format_exc()})
+            # Carry the id so pythonagent.js rejects the pending runGoal promise
+            send({"event":"error", "id": req_id, "error": str(e), "trace": traceback.format_exc()})
 
 if __name__ == "__main__":
     main()
@@ -3,16 +3,223 @@
 Agent Core - Main orchestration system for the reasoning and acting agent
 """
 
+from __future__ import annotations
+
 import json
+import logging
+import os
+import re
+import secrets
 import time
-from typing import Dict, List, Any, Optional
+from functools import lru_cache
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from abc import ABC, abstractmethod
 
-from perception import PerceptionEngine
-from reasoning import ReasoningEngine
-from action import ActionEngine
-from memory import MemorySystem
+# The engines (Gemini, PyObjC, atomacos...) are imported when an AgentCore is
+# built, so `agent_core.py --help` and bare imports stay fast
+if TYPE_CHECKING:
+    from perception import PerceptionSnapshot
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Apps that should never be selected as a target
+# CUSTOMIZE THIS LIST TO YOUR PREFERENCES:
+APP_BLACKLIST = frozenset(
+    {
+        "Siri",  # Voice assistant - not suitable for automation
+        "VoiceOver",  # Accessibility tool - not for automation
+        "VoiceOver Utility",  # Accessibility tool
+        "Accessibility Inspector",  # Developer tool
+        "Console",  # System log viewer - not user-facing
+        "Activity Monitor",  # System monitor - not for user tasks
+        "Disk Utility",  # System utility - not for user tasks
+        # "Terminal",  # REMOVED: You want Terminal available for automation
+        "Script Editor",  # Developer tool
+        "Automator",  # Automation tool - conflicts with our agent
+        "Shortcuts",  # iOS automation - conflicts with our agent
+        "Mission Control",  # System UI - not an app
+        "Launchpad",  # App launcher - not an app
+        "Dock",  # System UI - not an app
+        "Menu Bar",  # System UI - not an app
+        "Control Center",  # System UI - not an app
+        "Notification Center",  # System UI - not an app
+        "Spotlight",  # System search - not an app
+        "Finder",  # File manager - limited automation value
+        "Trash",  # System UI - not an app
+        "Desktop",  # System UI - not an app
+    }
+)
+_VSCODE_RE = re.compile(r"visual studio code|vscode", re.I)
+
+log = logging.getLogger("agent_core")
+
+# Minimum reasoning confidence for its goal_complete flag to end the run
+GOAL_COMPLETE_CONFIDENCE = 0.7
+
+# CLI log records are held in memory and written out in bursts (see main())
+LOG_BUFFER_RECORDS = 64
+
+
+def _flush_log() -> None:
+    """Push any buffered log records out to the terminal
+
+    The engines still print() straight to stdout, so this also runs before each
+    call into them to keep our lines ahead of theirs.
+    """
+    for handler in logging.getLogger().handlers:
+        handler.flush()
+
+
+def configure_logging(verbose: bool = False, buffered: bool = False) -> None:
+    """Send the agent's log narration to stdout, as the old print() calls did
+
+    With buffered, records are held and written in bursts (see _flush_log).
+    Not for agent_bridge.py, whose stdout carries the JSON protocol.
+    """
+    import logging.handlers
+    import sys
+
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(logging.Formatter("%(message)s"))
+    handler = console
+    if buffered:
+        handler = logging.handlers.MemoryHandler(
+            LOG_BUFFER_RECORDS, flushLevel=logging.WARNING, target=console
+        )
+    logging.basicConfig(
+        level=logging.DEBUG if verbose else logging.INFO,
+        handlers=[handler],
+        force=True,
+    )
+
+
+# Stand-in for run_autonomous_loop returning nothing; copied when used
+_NONE_RESULT = MappingProxyType(
+    {
+        "success": False,
+        "iterations": 0,
+        "errors": 0,
+        "progress": 0.0,
+        "message": "Agent completed without returning result",
+    }
+)
+
+# Results JSON larger than this is saved gzipped unless --no-compress is given
+COMPRESS_THRESHOLD = 64 * 1024
+
+# Characters in a goal that can't go into a results filename
+_FILENAME_TBL = str.maketrans({c: "_" for c in ' /\\:*?"<>|\t\n'})
+
+
+def _json_line(obj) -> bytes:
+    """One newline-terminated JSON record for the streamed results file"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(
+            obj,
+            default=str,
+            option=orjson.OPT_SERIALIZE_NUMPY
+            | orjson.OPT_NON_STR_KEYS
+            | orjson.OPT_APPEND_NEWLINE,
+        )
+    return (json.dumps(obj, default=str, separators=(",", ":")) + "\n").encode()
+
+
+_SEP50 = "=" * 50
+_SEP60 = "=" * 60
+_SEP80 = "=" * 80
+_RULE40 = "-" * 40
+
+# Common app name mappings
+APP_NAME_MAPPINGS = {
+    "iTerm": "iTerm2",
+    "iTerm2": "iTerm2",
+    "Terminal": "Terminal",
+    "Google Chrome": "Google Chrome",
+    "Chrome": "Google Chrome",
+    "Safari": "Safari",
+    "Calculator": "Calculator",
+    "System Settings": "System Settings",
+    "System Preferences": "System Settings",  # Old name
+}
+
+# Bundle IDs for common apps
+BUNDLE_IDS = {
+    "Calculator": "com.apple.calculator",
+    "Numbers": "com.apple.iWork.Numbers",
+    "Google Chrome": "com.google.Chrome",
+    "Safari": "com.apple.Safari",
+    "System Settings": "com.apple.systempreferences",
+    "Mail": "com.apple.mail",
+    "Calendar": "com.apple.iCal",
+    "Finder": "com.apple.finder",
+    "Cursor": "com.todesktop.230313mzl4w4u92",
+    "Visual Studio Code": "com.microsoft.VSCode",
+    "Terminal": "com.apple.Terminal",
+}
+
+# (name keywords, seconds to wait after launch), checked in order
+APP_LOAD_TIMES = (
+    (("chrome", "safari", "firefox", "edge"), 5),  # Browser apps need more time
+    (("xcode", "photoshop", "final cut", "logic"), 8),  # Heavy applications
+    (("calculator", "notes", "textedit", "terminal"), 2),  # Light applications
+)
+DEFAULT_APP_LOAD_TIME = 3  # Default for unknown apps
+
+
+# current_value states that satisfy an "...off" / "...on" completion indicator
+_OFF_VALUES = frozenset({"off", "disabled", "false"})
+_ON_VALUES = frozenset({"on", "enabled", "true"})
+
+# Stable app list first, goal last, so the prompt prefix repeats across calls
+APP_SELECTION_PROMPT = """
+Available applications:
+{apps_list}
+
+Consider:
+- Which app is most suitable for this specific goal?
+- Is the app likely to be installed and accessible?
+- Will the app provide the necessary functionality?
+
+Choose the best application to achieve this goal: "{goal}"
+
+Respond with just the application name (e.g., "Google Chrome" or "Calculator").
+"""
+
+# Goal keywords per intent, used by the fallback goal check
+GOAL_INTENT_KEYWORDS = {
+    "terminal": ("echo", "command", "terminal", "iterm", "bash", "shell"),
+    "battery": ("battery",),
+    "optimize": ("optimize",),
+    "search": ("search", "find", "look for"),
+    "math": ("calculate", "math", "calculator", "+", "-", "*", "/"),
+    "video": ("video", "show", "watch", "play"),
+}
+_INTENT_OF = {kw: intent for intent, kws in GOAL_INTENT_KEYWORDS.items() for kw in kws}
+# One pass over the goal; the zero-width lookahead also reports overlapping keywords
+_INTENT_RE = re.compile(
+    "(?=(%s))" % "|".join(map(re.escape, sorted(_INTENT_OF, key=len, reverse=True)))
+)
+
+
+@lru_cache(maxsize=64)
+def _goal_intents(goal_lower: str) -> frozenset:
+    return frozenset(_INTENT_OF[m.group(1)] for m in _INTENT_RE.finditer(goal_lower))
+
+
+@lru_cache(maxsize=128)
+def _app_load_time(app_name: str) -> int:
+    name = app_name.lower()
+    for keywords, seconds in APP_LOAD_TIMES:
+        if any(keyword in name for keyword in keywords):
+            return seconds
+    return DEFAULT_APP_LOAD_TIME
 
 
 @dataclass
@@ -26,6 +233,7 @@ class AgentState:
     last_action: str
     error_count: int
     session_id: str
+    cancelled: bool = False  # set from the SIGINT handler in main()
 
 
 class AgentCore:
@@ -34,7 +242,26 @@ class AgentCore:
     Implements the perceive-reason-act loop for autonomous operation
     """
 
-    def __init__(self, event_cb=None):
+    FOCUS_TIMEOUT = 1.0  # seconds to wait for an activated app to come forward
+    FOCUS_POLL_INTERVAL = 0.05
+
+    APP_DIRECTORIES = (
+        "/Applications",
+        "/System/Applications",
+        "/Applications/Utilities",
+        "/System/Applications/Utilities",
+    )
+    _APP_REF_TTL = 0.5  # seconds an app ref lookup is reused
+
+    # (directory mtime signature, installed app names), shared across instances
+    _APPS_CACHE: Optional[Tuple[Tuple[int, ...], List[str]]] = None
+
+    def __init__(self, event_cb=None, max_iterations: int = 50, max_errors: int = 5):
+        from perception import PerceptionEngine
+        from reasoning import ReasoningEngine
+        from action import ActionEngine
+        from memory import MemorySystem
+
         self.perception = PerceptionEngine()
         self.reasoning = ReasoningEngine()
         self.action = ActionEngine()
@@ -42,6 +269,12 @@ class AgentCore:
 
         # Optional callback used by agent_bridge.py to stream step updates to Electron
         self._event_cb = event_cb
+        self._app_ref_cache: Dict[str, Tuple[float, Any]] = {}
+        self._apps_list_cache: Tuple[Optional[tuple], str] = (None, "")
+        # (goal, app list) -> Gemini's pick; the bridge reuses one agent across goals
+        self._app_choice_cache: Dict[Tuple[str, tuple], str] = {}
+        # Binary file run_autonomous_loop streams per-iteration JSON lines to
+        self._result_fp = None
 
         self.state = AgentState(
             goal="",
@@ -50,14 +283,15 @@ class AgentCore:
             confidence=0.0,
             last_action="",
             error_count=0,
-            session_id=time.strftime("%Y%m%d_%H%M%S"),
+            session_id=f"{int(time.time())}_{secrets.token_hex(4)}",
         )
 
-        self.max_errors = 5
-        self.max_iterations = 50
+        self.max_errors = max_errors
+        self.max_iterations = max_iterations
 
     def _emit(self, kind: str, **data):
         """Emit a structured step event to the bridge (safe no-op if no callback)."""
+        # The bridge coalesces step lines on its own flush timer (send_buffered)
         try:
             if self._event_cb:
                 self._event_cb({"kind": kind, **data})
@@ -65,121 +299,158 @@ class AgentCore:
             # Never fail the run because of a progress callback
             pass
 
-    def perceive(self, target_app: str = None, goal: str = "") -> Dict[str, Any]:
+    def _emit_perceive_end(self, perception: PerceptionSnapshot) -> None:
+        """Emit perceive.end with the UI, visual and correlated element counts"""
+        visual_count = 0
+        if perception.visual_analysis:
+            visual_count = len(perception.visual_analysis.interactive_elements)
+        correlated = (perception.correlations or {}).get("matched_elements", 0)
+        self._emit(
+            "perceive.end",
+            ui=len(perception.ui_signals),
+            visual=visual_count,
+            correlated=correlated,
+        )
+
+    def _emit_reason_end(self, reasoning_result: Dict[str, Any]) -> None:
+        """Emit reason.end with the plan's confidence and action count"""
+        self._emit(
+            "reason.end",
+            confidence=reasoning_result.get("confidence", 0.0),
+            actions=len(reasoning_result.get("plan", [])),
+        )
+
+    def _settle(self, watch, timeout: float) -> None:
+        """Block until an observed UI change or timeout; plain sleep without an observer"""
+        if watch is None:
+            time.sleep(timeout)
+        else:
+            self.action._wait_for_ui_change(watch, timeout)
+
+    def perceive(self, target_app: str = None, goal: str = "") -> PerceptionSnapshot:
         """
         Perceive the current environment using hybrid accessibility + visual analysis.
         """
-        print("🔍 PERCEIVING: Gathering hybrid environmental signals...")
+        log.info("🔍 PERCEIVING: Gathering hybrid environmental signals...")
 
         try:
             # Use hybrid perception that combines accessibility and visual analysis
+            _flush_log()
             perception_data = self.perception.get_hybrid_perception(target_app, goal)
 
             # Handle app launching if no UI signals found
-            if len(perception_data.get("ui_signals", [])) == 0 and target_app:
-                self._handle_app_launching(target_app, perception_data)
-                # Re-run hybrid perception after potential launch
-                perception_data = self.perception.get_hybrid_perception(
-                    target_app, goal
-                )
+            if not perception_data.ui_signals and target_app:
+                rescan = self._handle_app_launching(target_app, goal)
+                perception_data = rescan or perception_data
 
             # Add timestamp for tracking
-            perception_data["timestamp"] = time.time()
+            perception_data.timestamp = time.time()
 
             # Store comprehensive perception data in memory
             self.memory.store_perception(
-                ui_signals=perception_data.get("ui_signals", []),
-                system_state=perception_data.get("system_state"),
-                context=perception_data.get("context", {}),
-                visual_analysis=perception_data.get("visual_analysis"),
-                correlations=perception_data.get("correlations"),
-                timestamp=perception_data["timestamp"],
+                ui_signals=perception_data.ui_signals,
+                system_state=perception_data.system_state,
+                context=perception_data.context,
+                visual_analysis=perception_data.visual_analysis,
+                correlations=perception_data.correlations,
+                timestamp=perception_data.timestamp,
             )
 
             # Enhanced logging with hybrid data
-            ui_count = len(perception_data.get("ui_signals", []))
+            ui_count = len(perception_data.ui_signals)
             visual_count = 0
-            if perception_data.get("visual_analysis"):
-                visual_count = len(
-                    perception_data["visual_analysis"].interactive_elements
-                )
+            if perception_data.visual_analysis:
+                visual_count = len(perception_data.visual_analysis.interactive_elements)
 
-            perception_type = perception_data.get("perception_type", "unknown")
+            perception_type = perception_data.perception_type
             matched_elements = 0
-            if perception_data.get("correlations"):
-                matched_elements = perception_data["correlations"].get(
+            if perception_data.correlations:
+                matched_elements = perception_data.correlations.get(
                     "matched_elements", 0
                 )
 
-            print(f"✅ Hybrid perception complete:")
-            print(f"   📊 Accessibility: {ui_count} elements")
-            print(f"   👁️  Visual: {visual_count} elements")
-            print(f"   🔗 Correlated: {matched_elements} elements")
-            print(f"   🎯 Type: {perception_type}")
+            log.info("✅ Hybrid perception complete:")
+            log.info("   📊 Accessibility: %s elements", ui_count)
+            log.info("   👁️  Visual: %s elements", visual_count)
+            log.info("   🔗 Correlated: %s elements", matched_elements)
+            log.info("   🎯 Type: %s", perception_type)
 
-            if perception_data.get("system_state"):
-                battery = perception_data["system_state"].battery_level
-                print(f"   🔋 System: {battery}% battery")
+            if perception_data.system_state:
+                battery = perception_data.system_state.battery_level
+                log.info("   🔋 System: %s%% battery", battery)
 
             return perception_data
 
         except Exception as e:
-            print(f"❌ Hybrid perception error: {e}")
-            import traceback
+            # Flapping AX errors can hit this every iteration; the stack only with --verbose
+            log.warning(
+                "❌ Hybrid perception error: %s",
+                e,
+                exc_info=log.isEnabledFor(logging.DEBUG),
+            )
+            from perception import PerceptionSnapshot
 
-            traceback.print_exc()
-            return {"error": str(e)}
+            return PerceptionSnapshot(error=str(e))
 
     def _handle_app_launching(
-        self, target_app: str, perception_data: Dict[str, Any]
-    ) -> None:
+        self, target_app: str, goal: str = ""
+    ) -> Optional[PerceptionSnapshot]:
         """
         Handle app launching logic with comprehensive error handling.
+        Returns fresh perception if the app was launched, else None.
         """
         try:
-            import atomacos as atomac
-
             # Check if app is already running
-            app = atomac.getAppRefByLocalizedName(target_app)
+            app = self._app_ref(target_app)
             if app:
-                print(f"   ⚠️  {target_app} is already running but no UI elements found")
-                print(
-                    f"   🤖 Letting reasoning engine handle app-specific initialization..."
+                log.info(
+                    "   ⚠️  %s is already running but no UI elements found", target_app
+                )
+                log.info(
+                    "   🤖 Letting reasoning engine handle app-specific initialization..."
                 )
             else:
-                print(f"   🚀 {target_app} not running, attempting to launch...")
+                log.info("   🚀 %s not running, attempting to launch...", target_app)
+                _flush_log()
                 launch_result = self.action._execute_launch_app(target_app)
 
                 if launch_result.get("success", False):
-                    print(f"   ✅ {launch_result.get('result', 'App launched')}")
+                    log.info("   ✅ %s", launch_result.get("result", "App launched"))
 
                     # Dynamic wait time based on app type for optimal loading
                     wait_time = self._get_app_load_time(target_app)
-                    print(
-                        f"   ⏳ Waiting {wait_time}s for {target_app} to fully load..."
+                    log.info(
+                        "   ⏳ Waiting %ss for %s to fully load...",
+                        wait_time,
+                        target_app,
                     )
                     time.sleep(wait_time)
 
-                    # Re-scan for elements after launch
-                    new_ui_signals = self.perception.discover_ui_signals(target_app)
-                    print(f"   📊 Found {len(new_ui_signals)} elements after launch")
-
-                    # Update perception data with new elements
-                    perception_data["ui_signals"] = new_ui_signals
+                    # Single full re-scan now that the app is up
+                    _flush_log()
+                    rescan = self.perception.get_hybrid_perception(target_app, goal)
+                    log.info(
+                        "   📊 Found %s elements after launch",
+                        len(rescan.ui_signals),
+                    )
+                    return rescan
 
         except Exception as e:
-            print(f"   ⚠️  Error during app launching: {e}")
-            print(f"   🤖 Letting reasoning engine handle initialization...")
+            log.info("   ⚠️  Error during app launching: %s", e)
+            log.info("   🤖 Letting reasoning engine handle initialization...")
 
-    def reason(self, goal: str, perception_data: Dict[str, Any]) -> Dict[str, Any]:
+        return None
+
+    def reason(self, goal: str, perception_data: PerceptionSnapshot) -> Dict[str, Any]:
         """Reason about the goal and current state to determine next actions"""
-        print("🧠 REASONING: Analyzing goal and current state...")
+        log.info("🧠 REASONING: Analyzing goal and current state...")
 
         try:
             # Update agent state
             self.state.goal = goal
 
             # Get knowledge context
+            _flush_log()
             knowledge = self.reasoning.gather_knowledge(goal, perception_data)
 
             # Generate reasoning
@@ -193,32 +464,36 @@ class AgentCore:
             # Store reasoning in memory
             self.memory.store_reasoning(reasoning_result)
 
-            print(
-                f"✅ Reasoning complete: {reasoning_result['confidence']:.2f} confidence"
+            log.info(
+                "✅ Reasoning complete: %.2f confidence", reasoning_result["confidence"]
             )
             return reasoning_result
 
         except Exception as e:
-            print(f"❌ Reasoning error: {e}")
+            log.warning("❌ Reasoning error: %s", e)
             return {"error": str(e), "plan": [], "confidence": 0.0}
 
     def reason_with_visual(
-        self, goal: str, perception_data: Dict[str, Any]
+        self, goal: str, perception_data: PerceptionSnapshot
     ) -> Dict[str, Any]:
         """
         Combined VLM + Reasoning in a single API call.
         """
-        print("   🎯 Combining visual analysis and reasoning...")
+        log.info("   🎯 Combining visual analysis and reasoning...")
 
         try:
-            # Get screenshot for visual analysis
-            screenshot_path = None
+            # Reuse the screenshot perception analyzed; nothing has acted since
+            screenshot_path = perception_data.screenshot_path
+            if screenshot_path and not os.path.exists(screenshot_path):
+                screenshot_path = None
+            _flush_log()
             if (
-                hasattr(self.perception, "vlm_analyzer")
+                not screenshot_path
+                and hasattr(self.perception, "vlm_analyzer")
                 and self.perception.vlm_analyzer
             ):
                 screenshot_path = self.perception.vlm_analyzer.capture_screenshot(
-                    perception_data.get("target_app", "")
+                    perception_data.target_app
                 )
 
             # Use reasoning engine with visual context
@@ -227,105 +502,158 @@ class AgentCore:
             )
 
         except Exception as e:
-            print(f"❌ Combined VLM+Reasoning error: {e}")
+            log.warning("❌ Combined VLM+Reasoning error: %s", e)
             return {"error": str(e), "plan": [], "confidence": 0.0}
 
     def act(self, reasoning_result: Dict[str, Any]) -> Dict[str, Any]:
         """Execute actions based on reasoning results"""
-        print("🎯 ACTING: Executing planned actions...")
+        log.info("🎯 ACTING: Executing planned actions...")
 
         try:
             plan = reasoning_result.get("plan", [])
             if not plan:
-                print("⚠️  No actions to execute")
+                log.info("⚠️  No actions to execute")
                 return {"success": False, "reason": "No actions in plan"}
 
             # Execute actions one at a time for continuous observation
+            n = len(plan)
             results = []
+            success_count = 0
             for i, action in enumerate(plan):
+                action_name = action["action"]
                 # Emit step start
                 self._emit(
                     "action.execute",
                     index=i + 1,
-                    total=len(plan),
-                    action=action.get("action"),
+                    total=n,
+                    action=action_name,
                     target=action.get("target"),
                     description=action.get("description"),
                 )
 
-                print(f"   Executing action {i+1}/{len(plan)}: {action['action']}")
+                log.info("   Executing action %s/%s: %s", i + 1, n, action_name)
 
                 try:
+                    watch = self.action._observe_ui_changes()
+                    _flush_log()
                     result = self.action.execute_action(action)
                     results.append(result)
+                    succeeded = bool(result.get("success"))
+                    success_count += succeeded
 
                     # Emit step result
                     self._emit(
                         "action.result",
                         index=i + 1,
-                        success=bool(result.get("success")),
+                        success=succeeded,
                         detail=str(result.get("result", ""))[:140],
                     )
 
                     # Update agent state
-                    self.state.last_action = action["action"]
-                    self.state.progress = (i + 1) / len(plan)
+                    self.state.last_action = action_name
+                    self.state.progress = (i + 1) / n
 
-                    # Small delay between actions
-                    time.sleep(0.5)
+                    # Wait for the UI to react, at most 0.5s
+                    self._settle(watch, 0.5)
+                    watch = None
 
                 except Exception as e:
-                    print(f"   ❌ Action failed: {e}")
+                    self._settle(watch, 0.0)  # just unsubscribe
+                    log.warning("   ❌ Action failed: %s", e)
                     self.state.error_count += 1
                     results.append({"success": False, "error": str(e)})
-                    return {"success": False, "error": str(e), "results": results}
+                    return {"success": False, "error": str(e), "results": tuple(results)}
 
                 # After each action, return control to main loop for observation
-                if i < len(plan) - 1:  # Not the last action
-                    print(
-                        f"   🔄 Returning to main loop for observation after action {i+1}"
-                    )
-                    self._emit(
-                        "action.partial_return", completed=i + 1, total=len(plan)
+                if i < n - 1:  # Not the last action
+                    log.info(
+                        "   🔄 Returning to main loop for observation after action %s",
+                        i + 1,
                     )
+                    self._emit("action.partial_return", completed=i + 1, total=n)
                     return {
                         "success": True,
                         "partial": True,
                         "completed_actions": i + 1,
-                        "total_actions": len(plan),
-                        "results": results,
+                        "total_actions": n,
+                        # Each act() call resumes at plan[0], so this is the delta
+                        # since the caller's last checkpoint; step results were
+                        # already streamed via action.result
+                        "new_results": tuple(results),
                     }
 
             # Store action results in memory
             self.memory.store_actions(results)
 
-            success_count = sum(1 for r in results if r.get("success", False))
-            print(
-                f"✅ All actions completed: {success_count}/{len(results)} successful"
+            log.info(
+                "✅ All actions completed: %s/%s successful",
+                success_count,
+                len(results),
             )
 
             return {
                 "success": success_count > 0,
-                "results": results,
+                "results": tuple(results),
                 "success_rate": success_count / len(results) if results else 0,
             }
 
         except Exception as e:
-            print(f"❌ Action error: {e}")
+            log.warning("❌ Action error: %s", e)
             return {"success": False, "error": str(e)}
 
     def run_autonomous_loop(
+        self,
+        goal: str,
+        target_app: str = None,
+        max_iterations: int = None,
+        result_fp=None,
+    ):
+        """Run the complete perceive-reason-act loop autonomously
+
+        If result_fp (a binary file) is given, one JSON line per iteration is
+        streamed to it as the loop runs.
+        """
+        self._result_fp = result_fp
+        self.state.cancelled = False
+        try:
+            return self._run_autonomous_loop(goal, target_app, max_iterations)
+        finally:
+            self._result_fp = None
+            _flush_log()
+
+    def _record_progress(self, iteration: int, action_result: Dict[str, Any]):
+        """Append this iteration's outcome to the streamed result file, if any"""
+        fp = self._result_fp
+        if fp is None:
+            return
+        fp.write(
+            _json_line(
+                {
+                    "iteration": iteration,
+                    "action": self.state.last_action,
+                    "success": action_result.get("success", False),
+                    "partial": action_result.get("partial", False),
+                    "error": action_result.get("error"),
+                    "errors": self.state.error_count,
+                    "progress": self.state.progress,
+                    "timestamp": time.time(),
+                }
+            )
+        )
+        # Iterations are seconds apart; push each line out so a crash keeps it
+        fp.flush()
+
+    def _run_autonomous_loop(
         self, goal: str, target_app: str = None, max_iterations: int = None
     ):
-        """Run the complete perceive-reason-act loop autonomously"""
         # Intelligently choose target app if not specified
         if not target_app:
             target_app = self._choose_target_app(goal)
 
-        print(f"🤖 AUTONOMOUS AGENT STARTING")
-        print(f"Goal: {goal}")
-        print(f"Target App: {target_app}")
-        print("=" * 60)
+        log.info("🤖 AUTONOMOUS AGENT STARTING")
+        log.info("Goal: %s", goal)
+        log.info("Target App: %s", target_app)
+        log.info(_SEP60)
 
         iterations = 0
         max_iter = max_iterations or self.max_iterations
@@ -336,47 +664,48 @@ class AgentCore:
         )
 
         # CRITICAL: Focus the target app before starting
-        print(f"\n🎯 FOCUSING TARGET APP: {target_app}")
+        log.info("\n🎯 FOCUSING TARGET APP: %s", target_app)
         focus_result = self._focus_target_app(target_app)
         if not focus_result:
-            print(f"❌ Failed to focus {target_app}, continuing anyway...")
+            log.warning("❌ Failed to focus %s, continuing anyway...", target_app)
         else:
-            print(f"✅ Successfully focused {target_app}")
+            log.info("✅ Successfully focused %s", target_app)
 
         self._emit("focus.result", app=target_app, success=bool(focus_result))
 
         # Create long-range plan before starting the loop
         self._emit("plan.start", goal=goal, app=target_app)
-        print(f"\n🎯 CREATING LONG-RANGE PLAN")
-        print("-" * 40)
+        log.info("\n🎯 CREATING LONG-RANGE PLAN")
+        log.info(_RULE40)
 
         # Get initial perception for planning
         initial_perception = self.perceive(target_app, goal)
-        if "error" in initial_perception:
-            print(f"❌ Initial perception failed: {initial_perception['error']}")
+        if initial_perception.error:
+            log.warning("❌ Initial perception failed: %s", initial_perception.error)
             return {
                 "success": False,
                 "iterations": 0,
                 "errors": 1,
                 "progress": 0.0,
-                "message": f"Initial perception failed: {initial_perception['error']}",
+                "message": f"Initial perception failed: {initial_perception.error}",
             }
 
         # Create long-range plan
-        ui_signals = initial_perception.get("ui_signals", [])
-        system_state = initial_perception.get("system_state", {})
+        ui_signals = initial_perception.ui_signals
+        system_state = initial_perception.system_state
+        _flush_log()
         plan_result = self.reasoning.create_long_range_plan(
             goal, target_app, ui_signals, system_state
         )
 
         if "error" in plan_result:
-            print(f"❌ Long-range planning failed: {plan_result['error']}")
-            print("   Continuing without long-range plan...")
+            log.warning("❌ Long-range planning failed: %s", plan_result["error"])
+            log.info("   Continuing without long-range plan...")
         else:
-            print(f"✅ Long-range plan created successfully")
-            print(f"   Goal: {plan_result.get('goal', 'Unknown')}")
-            print(f"   End State: {plan_result.get('end_state', 'Not defined')}")
-            print(f"   Steps: {len(plan_result.get('steps', []))}")
+            log.info("✅ Long-range plan created successfully")
+            log.info("   Goal: %s", plan_result.get("goal", "Unknown"))
+            log.info("   End State: %s", plan_result.get("end_state", "Not defined"))
+            log.info("   Steps: %s", len(plan_result.get("steps", [])))
 
         if "error" not in plan_result:
             self._emit(
@@ -387,98 +716,145 @@ class AgentCore:
             )
 
         # Execute the task with continuous perceive-reason-act loop
-        print(f"\n🔄 STARTING PERCEIVE-REASON-ACT LOOP")
-        print("-" * 40)
+        log.info("\n🔄 STARTING PERCEIVE-REASON-ACT LOOP")
+        log.info(_RULE40)
+
+        # (perception, reasoning) observed after the last action, reused next iteration
+        carried = None
+        # Whether the last post-action step kept the previous plan without asking
+        plan_reused = False
+        # Nothing has acted since the planning observation, so the first step uses it
+        prefetched = initial_perception
 
         try:
             while iterations < max_iter and self.state.error_count < self.max_errors:
+                if self.state.cancelled:
+                    log.info("\n⏹️  Agent stopped by user")
+                    return {
+                        "success": False,
+                        "iterations": iterations,
+                        "errors": self.state.error_count,
+                        "progress": self.state.progress,
+                        "message": "Stopped by user",
+                    }
                 iterations += 1
-                print(f"\n🔄 ITERATION {iterations}/{max_iter}")
-                print("=" * 50)
+                _flush_log()  # the previous iteration's lines go out together
+                log.info("\n🔄 ITERATION %s/%s", iterations, max_iter)
+                log.info(_SEP50)
 
                 self._emit("loop.iteration", n=iterations, max=max_iter)
 
-                # 1. Perceive (observe current state)
-                print(f"🔍 PERCEIVING: Gathering environmental signals...")
-                self._emit("perceive.start", app=target_app)
-                perception_data = self.perceive(target_app, goal)
-                if "error" in perception_data:
-                    print(f"❌ Perception failed: {perception_data['error']}")
-                    self.state.error_count += 1
-                    continue
+                # 1+2. Perceive and reason, unless the previous iteration's post-action
+                # observation already covered this exact UI state
+                if carried is not None:
+                    perception_data, reasoning_result = carried
+                    carried = None
+                    log.info("🔍 Using post-action observation from the last iteration")
+                else:
+                    # 1. Perceive (observe current state)
+                    log.info("🔍 PERCEIVING: Gathering environmental signals...")
+                    self._emit("perceive.start", app=target_app)
+                    if prefetched is not None:
+                        perception_data, prefetched = prefetched, None
+                    else:
+                        perception_data = self.perceive(target_app, goal)
+                    if perception_data.error:
+                        log.warning("❌ Perception failed: %s", perception_data.error)
+                        self.state.error_count += 1
+                        continue
 
-                ui_count = len(perception_data.get("ui_signals", []))
-                visual_count = 0
-                if perception_data.get("visual_analysis"):
-                    visual_count = len(
-                        perception_data["visual_analysis"].interactive_elements
-                    )
-                correlated = (perception_data.get("correlations") or {}).get(
-                    "matched_elements", 0
-                )
-                self._emit(
-                    "perceive.end", ui=ui_count, visual=visual_count, correlated=correlated
-                )
+                    self._emit_perceive_end(perception_data)
 
-                # 2. Combined VLM + Reasoning in single step
-                print(
-                    f"🧠 COMBINED VLM + REASONING: Analyzing goal and visual state..."
-                )
-                self._emit("reason.start")
-                reasoning_result = self.reason_with_visual(goal, perception_data)
-                if "error" in reasoning_result:
-                    print(f"❌ Reasoning failed: {reasoning_result['error']}")
-                    self.state.error_count += 1
-                    continue
+                    # 2. Combined VLM + Reasoning in single step
+                    log.info(
+                        "🧠 COMBINED VLM + REASONING: Analyzing goal and visual state..."
+                    )
+                    self._emit("reason.start")
+                    reasoning_result = self.reason_with_visual(goal, perception_data)
+                    if "error" in reasoning_result:
+                        log.warning(
+                            "❌ Reasoning failed: %s", reasoning_result["error"]
+                        )
+                        self.state.error_count += 1
+                        continue
 
-                actions_planned = len(reasoning_result.get("plan", []))
-                self._emit(
-                    "reason.end",
-                    confidence=reasoning_result.get("confidence", 0.0),
-                    actions=actions_planned,
-                )
+                    self._emit_reason_end(reasoning_result)
 
                 # 3. Act (execute one action)
-                print(f"🎯 ACTING: Executing planned action...")
+                log.info("🎯 ACTING: Executing planned action...")
+                watch = self.action._observe_ui_changes()
                 action_result = self.act(reasoning_result)
 
                 if not action_result.get("success", False):
-                    print(
-                        f"❌ Action failed: {action_result.get('error', 'Unknown error')}"
+                    log.warning(
+                        "❌ Action failed: %s",
+                        action_result.get("error", "Unknown error"),
                     )
-                    print(
-                        f"   Error count: {self.state.error_count + 1}/{self.max_errors}"
+                    log.info(
+                        "   Error count: %s/%s",
+                        self.state.error_count + 1,
+                        self.max_errors,
                     )
                     self.state.error_count += 1
+                    self._record_progress(iterations, action_result)
+                    self._settle(watch, 0.0)  # just unsubscribe
                     # Don't check goal achievement if action failed
                     continue
                 else:
-                    print(f"✅ Action completed successfully")
+                    log.info("✅ Action completed successfully")
                     self.state.error_count = 0  # Reset on success
+                    self._record_progress(iterations, action_result)
 
-                # 4. Continuous Observation: Observe state after action
-                print(f"🔍 OBSERVING: Checking state after action...")
+                # 4. Continuous Observation: let the UI settle, then observe state after action
+                self._settle(watch, 1.0)
+                log.info("🔍 OBSERVING: Checking state after action...")
+                self._emit("perceive.start", app=target_app)
                 post_action_perception = self.perceive(target_app, goal)
-                if post_action_perception and not post_action_perception.get("error"):
-                    print(
-                        f"   📊 Post-action state: {len(post_action_perception.get('ui_signals', []))} elements"
+                if not post_action_perception.error:
+                    self._emit_perceive_end(post_action_perception)
+                    log.info(
+                        "   📊 Post-action state: %s elements",
+                        len(post_action_perception.ui_signals),
                     )
 
-                    # Generate new reasoning based on updated state
-                    print(f"🧠 REASONING: Analyzing updated state...")
-                    updated_reasoning = self.reason_with_visual(
-                        goal, post_action_perception
-                    )
+                    # Generate new reasoning based on updated state, unless the
+                    # action left the UI exactly as the current plan saw it. act()
+                    # always runs plan[0], so only the steps after it are kept,
+                    # and a kept plan is never kept a second time in a row
+                    remaining = reasoning_result.get("plan", [])[1:]
+                    if (
+                        remaining
+                        and not plan_reused
+                        and post_action_perception.ui_signals
+                        and self._ui_fingerprint(post_action_perception)
+                        == self._ui_fingerprint(perception_data)
+                    ):
+                        log.info("🧠 REASONING: UI unchanged, continuing current plan")
+                        self._emit("reason.cached")
+                        updated_reasoning = {**reasoning_result, "plan": remaining}
+                        plan_reused = True
+                    else:
+                        plan_reused = False
+                        log.info("🧠 REASONING: Analyzing updated state...")
+                        self._emit("reason.start")
+                        updated_reasoning = self.reason_with_visual(
+                            goal, post_action_perception
+                        )
+                        if not updated_reasoning.get("error"):
+                            self._emit_reason_end(updated_reasoning)
                     if not updated_reasoning.get("error"):
-                        print(
-                            f"   ✅ Updated reasoning: {updated_reasoning.get('confidence', 0):.2f} confidence"
+                        log.info(
+                            "   ✅ Updated reasoning: %.2f confidence",
+                            updated_reasoning.get("confidence", 0),
                         )
                         # Update perception data for goal checking
                         perception_data = post_action_perception
                         reasoning_result = updated_reasoning
+                        carried = (post_action_perception, updated_reasoning)
                     else:
-                        print(
-                            f"   ⚠️  Updated reasoning failed: {updated_reasoning.get('error')}"
+                        log.info(
+                            "   ⚠️  Updated reasoning failed: %s",
+                            updated_reasoning.get("error"),
                         )
 
                 # Only check goal achievement if action succeeded
@@ -486,7 +862,7 @@ class AgentCore:
                     goal, perception_data, reasoning_result
                 )
                 if goal_achieved:
-                    print(f"🎉 GOAL ACHIEVED: {goal}")
+                    log.info("🎉 GOAL ACHIEVED: %s", goal)
                     self._emit("goal.achieved", goal=goal)
                     return {
                         "success": True,
@@ -499,8 +875,9 @@ class AgentCore:
                 # Check confidence (only stop if very low confidence)
                 confidence = reasoning_result.get("confidence", 0)
                 if confidence < 0.1:  # Only stop if confidence is extremely low
-                    print(
-                        f"⚠️  Very low confidence ({confidence:.2f}), stopping to prevent errors"
+                    log.info(
+                        "⚠️  Very low confidence (%.2f), stopping to prevent errors",
+                        confidence,
                     )
                     self._emit("loop.low_confidence", confidence=confidence)
                     return {
@@ -511,18 +888,19 @@ class AgentCore:
                         "message": f"Stopped early: very low confidence ({confidence:.2f})",
                     }
                 elif confidence < 0.3:
-                    print(f"⚠️  Low confidence ({confidence:.2f}), but continuing...")
+                    log.info("⚠️  Low confidence (%.2f), but continuing...", confidence)
 
                 # Debug: Show why agent continues
-                print(
-                    f"🔄 Continuing loop: goal_achieved={goal_achieved}, confidence={confidence:.2f}, errors={self.state.error_count}/{self.max_errors}"
+                log.info(
+                    "🔄 Continuing loop: goal_achieved=%s, confidence=%.2f, errors=%s/%s",
+                    goal_achieved,
+                    confidence,
+                    self.state.error_count,
+                    self.max_errors,
                 )
 
-                # Brief pause between iterations
-                time.sleep(1)
-
         except KeyboardInterrupt:
-            print("\n⏹️  Agent stopped by user")
+            log.info("\n⏹️  Agent stopped by user")
             return {
                 "success": False,
                 "iterations": iterations,
@@ -531,7 +909,7 @@ class AgentCore:
                 "message": "Stopped by user",
             }
         except Exception as e:
-            print(f"❌ Unexpected error: {e}")
+            log.warning("❌ Unexpected error: %s", e)
             self.state.error_count += 1
             return {
                 "success": False,
@@ -542,11 +920,11 @@ class AgentCore:
             }
 
         # If we reach here, we hit max iterations without achieving the goal
-        print(f"\n🏁 AGENT FINISHED")
-        print(f"   Iterations: {iterations}")
-        print(f"   Errors: {self.state.error_count}")
-        print(f"   Final Progress: {self.state.progress:.2f}")
-        print(f"   ⚠️  Max iterations reached without achieving goal")
+        log.info("\n🏁 AGENT FINISHED")
+        log.info("   Iterations: %s", iterations)
+        log.info("   Errors: %s", self.state.error_count)
+        log.info("   Final Progress: %.2f", self.state.progress)
+        log.info("   ⚠️  Max iterations reached without achieving goal")
         self._emit("loop.max_iterations", iterations=iterations, max=max_iter)
 
         return {
@@ -571,6 +949,7 @@ class AgentCore:
     def _get_available_apps(self) -> List[str]:
         """Get list of available applications (open and installed)"""
         available_apps = []
+        seen = set()
 
         try:
             # Get currently open applications
@@ -583,47 +962,25 @@ class AgentCore:
                 )
                 for app in running_apps:
                     try:
-                        app_name = getattr(app, "AXTitle", None) or getattr(
-                            app, "AXIdentifier", None
-                        )
+                        app_name = self._app_display_name(app)
                         # BLACKLIST: Filter out VSCode from running apps
                         if (
                             app_name
-                            and app_name not in available_apps
-                            and "visual studio code" not in app_name.lower()
-                            and "vscode" not in app_name.lower()
+                            and app_name not in seen
+                            and not _VSCODE_RE.search(app_name)
                         ):
+                            seen.add(app_name)
                             available_apps.append(app_name)
                     except:
                         continue
             except:
                 pass
 
-            # Get installed applications from multiple directories
-            import os
-
-            app_directories = [
-                "/Applications",
-                "/System/Applications",
-                "/Applications/Utilities",
-                "/System/Applications/Utilities",
-            ]
-            for applications_dir in app_directories:
-                if os.path.exists(applications_dir):
-                    try:
-                        for item in os.listdir(applications_dir):
-                            if item.endswith(".app"):
-                                app_name = item[:-4]  # Remove .app extension
-                                # BLACKLIST: Filter out VSCode
-                                if (
-                                    app_name not in available_apps
-                                    and "visual studio code" not in app_name.lower()
-                                    and "vscode" not in app_name.lower()
-                                ):
-                                    available_apps.append(app_name)
-                    except PermissionError:
-                        # Skip directories we can't access
-                        continue
+            # Get installed applications (cached until an app directory changes)
+            for app_name in self._installed_apps():
+                if app_name not in seen:
+                    seen.add(app_name)
+                    available_apps.append(app_name)
 
             # Add common system apps
             system_apps = [
@@ -638,11 +995,12 @@ class AgentCore:
                 "Disk Utility",
             ]
             for app in system_apps:
-                if app not in available_apps:
+                if app not in seen:
+                    seen.add(app)
                     available_apps.append(app)
 
         except Exception as e:
-            print(f"   ⚠️  Error getting available apps: {e}")
+            log.info("   ⚠️  Error getting available apps: %s", e)
             # Fallback to common apps
             available_apps = [
                 "System Settings",
@@ -664,62 +1022,74 @@ class AgentCore:
 
         return available_apps  # Return all available apps
 
+    @staticmethod
+    def _app_display_name(app) -> Optional[str]:
+        """AXTitle, else AXIdentifier, of an app ref, read in one AX round-trip"""
+        try:
+            from ApplicationServices import AXUIElementCopyMultipleAttributeValues
+
+            err, values = AXUIElementCopyMultipleAttributeValues(
+                app.ref, ("AXTitle", "AXIdentifier"), 0, None
+            )
+            if err == 0 and values:
+                # Missing attributes come back as AXError values, not strings
+                for value in values:
+                    if isinstance(value, str) and value:
+                        return value
+                return None
+        except Exception:
+            pass
+        return getattr(app, "AXTitle", None) or getattr(app, "AXIdentifier", None)
+
+    def _installed_apps(self) -> List[str]:
+        """List .app bundles in APP_DIRECTORIES, rescanning only when one changes"""
+        dirs = [d for d in self.APP_DIRECTORIES if os.path.exists(d)]
+        sig = tuple(os.stat(d).st_mtime_ns for d in dirs)
+        cache = AgentCore._APPS_CACHE
+        if cache is not None and cache[0] == sig:
+            return cache[1]
+
+        installed = []
+        seen = set()
+        for applications_dir in dirs:
+            try:
+                with os.scandir(applications_dir) as entries:
+                    for entry in entries:
+                        name = entry.name
+                        if not name.endswith(".app"):
+                            continue
+                        app_name = name[:-4]  # Remove .app extension
+                        # BLACKLIST: Filter out VSCode
+                        if app_name in seen or _VSCODE_RE.search(app_name):
+                            continue
+                        seen.add(app_name)
+                        installed.append(app_name)
+            except PermissionError:
+                # Skip directories we can't access
+                continue
+
+        AgentCore._APPS_CACHE = (sig, installed)
+        return installed
+
     def _apply_app_blacklist(self, apps: List[str]) -> List[str]:
         """Apply blacklist to filter out unwanted applications"""
-        # Define blacklisted apps that should never be selected
-        # CUSTOMIZE THIS LIST TO YOUR PREFERENCES:
-        blacklisted_apps = {
-            "Siri",  # Voice assistant - not suitable for automation
-            "VoiceOver",  # Accessibility tool - not for automation
-            "VoiceOver Utility",  # Accessibility tool
-            "Accessibility Inspector",  # Developer tool
-            "Console",  # System log viewer - not user-facing
-            "Activity Monitor",  # System monitor - not for user tasks
-            "Disk Utility",  # System utility - not for user tasks
-            # "Terminal",  # REMOVED: You want Terminal available for automation
-            "Script Editor",  # Developer tool
-            "Automator",  # Automation tool - conflicts with our agent
-            "Shortcuts",  # iOS automation - conflicts with our agent
-            "Mission Control",  # System UI - not an app
-            "Launchpad",  # App launcher - not an app
-            "Dock",  # System UI - not an app
-            "Menu Bar",  # System UI - not an app
-            "Control Center",  # System UI - not an app
-            "Notification Center",  # System UI - not an app
-            "Spotlight",  # System search - not an app
-            "Finder",  # File manager - limited automation value
-            "Trash",  # System UI - not an app
-            "Desktop",  # System UI - not an app
-        }
-
-        # Filter out blacklisted apps
-        filtered_apps = []
-        for app in apps:
-            if app not in blacklisted_apps:
-                filtered_apps.append(app)
-            else:
-                print(f"   🚫 Blacklisted app: {app}")
+        # Filter out blacklisted apps; one summary line instead of one per hit
+        filtered_apps = [app for app in apps if app not in APP_BLACKLIST]
+        dropped = len(apps) - len(filtered_apps)
+        if dropped:
+            log.info("   🚫 Filtered %s blacklisted apps", dropped)
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug(
+                    "      %s", ", ".join(app for app in apps if app in APP_BLACKLIST)
+                )
 
-        print(f"   📊 App filtering: {len(apps)} → {len(filtered_apps)} apps")
+        log.info("   📊 App filtering: %s → %s apps", len(apps), len(filtered_apps))
         return filtered_apps
 
     def _normalize_app_name(self, app_name: str) -> str:
         """Normalize app names to handle common variations"""
-        # Common app name mappings
-        name_mappings = {
-            "iTerm": "iTerm2",
-            "iTerm2": "iTerm2",
-            "Terminal": "Terminal",
-            "Google Chrome": "Google Chrome",
-            "Chrome": "Google Chrome",
-            "Safari": "Safari",
-            "Calculator": "Calculator",
-            "System Settings": "System Settings",
-            "System Preferences": "System Settings",  # Old name
-        }
-
         # Return mapped name or original if no mapping exists
-        return name_mappings.get(app_name, app_name)
+        return APP_NAME_MAPPINGS.get(app_name, app_name)
 
     def _ask_gemini_for_app_selection(
         self, goal: str, available_apps: List[str]
@@ -730,190 +1100,205 @@ class AgentCore:
                 # Fallback to first available app if Gemini not available
                 return available_apps[0] if available_apps else None
 
-            # Create prompt for app selection
-            apps_list = "\n".join([f"- {app}" for app in available_apps])
-            prompt = f"""
-            Choose the best application to achieve this goal: "{goal}"
-            
-            Available applications:
-            {apps_list}
-            
-            Consider:
-            - Which app is most suitable for this specific goal?
-            - Is the app likely to be installed and accessible?
-            - Will the app provide the necessary functionality?
-            
-            Respond with just the application name (e.g., "Google Chrome" or "Calculator").
-            """
+            # Create prompt for app selection; the app list only changes with the apps
+            key = tuple(available_apps)
+            cached = self._app_choice_cache.get((goal, key))
+            if cached is not None:
+                log.debug("   ♻️  Reusing app selection for this goal: %s", cached)
+                return cached
+            if self._apps_list_cache[0] != key:
+                apps_list = "\n".join(f"- {app}" for app in available_apps)
+                self._apps_list_cache = (key, apps_list)
+            prompt = APP_SELECTION_PROMPT.format(
+                apps_list=self._apps_list_cache[1], goal=goal
+            )
 
             # VERBOSE: Show app selection prompt and response
-            print("\n" + "=" * 80)
-            print("📝 APP SELECTION PROMPT SENT TO GEMINI:")
-            print("=" * 80)
-            print(prompt)
-            print("=" * 80)
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug(
+                    "\n%s\n📝 APP SELECTION PROMPT SENT TO GEMINI:\n%s\n%s\n%s",
+                    _SEP80,
+                    _SEP80,
+                    prompt,
+                    _SEP80,
+                )
 
             response = self.reasoning.model.generate_content(prompt)
             selected_app = response.text.strip()
 
             # VERBOSE: Show Gemini's response
-            print("\n" + "=" * 80)
-            print("🤖 GEMINI APP SELECTION RESPONSE:")
-            print("=" * 80)
-            print(f"Selected App: {selected_app}")
-            print("=" * 80)
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug(
+                    "\n%s\n🤖 GEMINI APP SELECTION RESPONSE:\n%s\nSelected App: %s\n%s",
+                    _SEP80,
+                    _SEP80,
+                    selected_app,
+                    _SEP80,
+                )
 
             # Validate the selection
             if selected_app in available_apps:
+                self._app_choice_cache[(goal, key)] = selected_app
                 return selected_app
             else:
                 # Fallback to first available app
                 return available_apps[0] if available_apps else None
 
         except Exception as e:
-            print(f"   ⚠️  Error in app selection: {e}")
+            log.info("   ⚠️  Error in app selection: %s", e)
             return available_apps[0] if available_apps else None
 
     def _focus_target_app(self, app_name: str) -> bool:
         """Focus the target application to ensure it's active"""
         try:
             import atomacos as atomac
-            import subprocess
-            import time
 
             # Normalize the app name to handle common variations
             normalized_name = self._normalize_app_name(app_name)
-            print(f"      🎯 Focusing {app_name} (normalized: {normalized_name})...")
+            log.info(
+                "      🎯 Focusing %s (normalized: %s)...", app_name, normalized_name
+            )
+
+            # Already in front: skip the lookup, activate and verify round-trips
+            try:
+                frontmost_app = atomac.getFrontmostApp()
+            except Exception:
+                frontmost_app = None  # nothing frontmost; go through the full path
+            if (
+                frontmost_app
+                and getattr(frontmost_app, "AXTitle", "") == normalized_name
+            ):
+                log.info("      ✅ %s is already focused", normalized_name)
+                return True
 
             # Try to get the app reference with normalized name
-            app = atomac.getAppRefByLocalizedName(normalized_name)
+            app = self._app_ref(normalized_name)
 
             if not app:
-                print(
-                    f"      🚀 App not running, attempting to launch {normalized_name}..."
+                log.info(
+                    "      🚀 App not running, attempting to launch %s...",
+                    normalized_name,
                 )
                 # Try multiple launch methods
                 launch_success = False
 
                 # Method 1: Try with normalized name
-                try:
-                    subprocess.run(["open", "-a", normalized_name], check=True)
+                if self._open_app(name=normalized_name):
                     time.sleep(3)  # Wait for app to start
-                    app = atomac.getAppRefByLocalizedName(normalized_name)
+                    app = self._app_ref(normalized_name)
                     if app:
                         launch_success = True
-                except subprocess.CalledProcessError:
-                    pass
 
                 # Method 2: Try with bundle ID
                 if not launch_success:
                     bundle_id = self._get_bundle_id(app_name)
-                    if bundle_id:
-                        try:
-                            subprocess.run(["open", "-b", bundle_id], check=True)
-                            time.sleep(3)
-                            app = atomac.getAppRefByLocalizedName(normalized_name)
-                            if app:
-                                launch_success = True
-                        except:
-                            pass
-
-                # Method 3: Try with original name
-                if not launch_success:
-                    try:
-                        subprocess.run(["open", "-a", app_name], check=True)
+                    if bundle_id and self._open_app(bundle_id=bundle_id):
                         time.sleep(3)
-                        app = atomac.getAppRefByLocalizedName(app_name)
+                        app = self._app_ref(normalized_name)
                         if app:
                             launch_success = True
-                    except:
-                        pass
+
+                # Method 3: Try with original name
+                if not launch_success and self._open_app(name=app_name):
+                    time.sleep(3)
+                    app = self._app_ref(app_name)
+                    if app:
+                        launch_success = True
 
                 if not launch_success:
-                    print(f"      ❌ Failed to launch {normalized_name}")
+                    log.warning("      ❌ Failed to launch %s", normalized_name)
+                    self._app_ref_cache.pop(normalized_name, None)
                     return False
 
             if app:
                 # Focus the app
                 app.activate()
-                time.sleep(1)  # Wait for focus
 
-                # Verify the app is focused
-                frontmost_app = atomac.getFrontmostApp()
-                if (
-                    frontmost_app
-                    and getattr(frontmost_app, "AXTitle", "") == normalized_name
-                ):
-                    print(f"      ✅ {normalized_name} is now focused")
+                # Verify the app is focused, polling for up to 1s instead of
+                # always sleeping the full second
+                deadline = time.monotonic() + self.FOCUS_TIMEOUT
+                while True:
+                    frontmost_app = atomac.getFrontmostApp()
+                    focused = (
+                        frontmost_app
+                        and getattr(frontmost_app, "AXTitle", "") == normalized_name
+                    )
+                    if focused or time.monotonic() >= deadline:
+                        break
+                    time.sleep(self.FOCUS_POLL_INTERVAL)
+                if focused:
+                    log.info("      ✅ %s is now focused", normalized_name)
                     return True
                 else:
-                    print(
-                        f"      ⚠️  {normalized_name} focus verification failed, trying alternative method"
+                    log.info(
+                        "      ⚠️  %s focus verification failed, trying alternative method",
+                        normalized_name,
                     )
-                    # Try using osascript to focus
-                    try:
-                        subprocess.run(
-                            [
-                                "osascript",
-                                "-e",
-                                f'tell application "{normalized_name}" to activate',
-                            ]
-                        )
+                    # Ask Launch Services to bring it forward
+                    if self._open_app(name=normalized_name):
                         time.sleep(1)
-                        print(f"      ✅ {normalized_name} focused via osascript")
-                        return True
-                    except:
-                        # Final fallback - just return True if we have the app reference
-                        print(f"      ✅ {normalized_name} launched successfully")
+                        log.info("      ✅ %s focused via NSWorkspace", normalized_name)
                         return True
+                    # Final fallback - just return True if we have the app reference
+                    log.info("      ✅ %s launched successfully", normalized_name)
+                    return True
             else:
-                print(f"      ❌ Could not get reference to {app_name}")
+                log.warning("      ❌ Could not get reference to %s", app_name)
                 return False
 
         except Exception as e:
-            print(f"      ❌ Error focusing {app_name}: {e}")
+            log.warning("      ❌ Error focusing %s: %s", app_name, e)
+            self._app_ref_cache.clear()  # the cached ref may be what failed
+            return False
+
+    def _open_app(self, name: str = None, bundle_id: str = None) -> bool:
+        """Launch or bring forward an app via NSWorkspace (`open` without AppKit)"""
+        try:
+            from AppKit import NSWorkspace, NSWorkspaceOpenConfiguration
+            from Foundation import NSURL
+        except ImportError:
+            import subprocess
+
+            cmd = ["open", "-b", bundle_id] if bundle_id else ["open", "-a", name]
+            return subprocess.run(cmd).returncode == 0
+
+        workspace = NSWorkspace.sharedWorkspace()
+        if bundle_id:
+            url = workspace.URLForApplicationWithBundleIdentifier_(bundle_id)
+        else:
+            path = workspace.fullPathForApplication_(name)
+            url = NSURL.fileURLWithPath_(path) if path else None
+        if url is None:
             return False
 
+        config = NSWorkspaceOpenConfiguration.configuration()
+        config.setActivates_(True)
+        workspace.openApplicationAtURL_configuration_completionHandler_(
+            url, config, None
+        )
+        return True
+
+    def _app_ref(self, name: str):
+        """atomac app ref by localized name; found refs are reused for _APP_REF_TTL"""
+        import atomacos as atomac
+
+        now = time.monotonic()
+        hit = self._app_ref_cache.get(name)
+        if hit and now - hit[0] < self._APP_REF_TTL:
+            return hit[1]
+        app = atomac.getAppRefByLocalizedName(name)
+        if app:
+            # Misses are not cached: callers re-check right after launching the app
+            self._app_ref_cache[name] = (now, app)
+        return app
+
     def _get_bundle_id(self, app_name: str) -> str:
         """Get bundle ID for common apps"""
-        bundle_ids = {
-            "Calculator": "com.apple.calculator",
-            "Numbers": "com.apple.iWork.Numbers",
-            "Google Chrome": "com.google.Chrome",
-            "Safari": "com.apple.Safari",
-            "System Settings": "com.apple.systempreferences",
-            "Mail": "com.apple.mail",
-            "Calendar": "com.apple.iCal",
-            "Finder": "com.apple.finder",
-            "Cursor": "com.todesktop.230313mzl4w4u92",
-            "Visual Studio Code": "com.microsoft.VSCode",
-            "Terminal": "com.apple.Terminal",
-        }
-        return bundle_ids.get(app_name, "")
+        return BUNDLE_IDS.get(app_name, "")
 
     def _get_app_load_time(self, app_name: str) -> int:
         """Get appropriate load time for different app types"""
-        # Browser apps need more time
-        if any(
-            browser in app_name.lower()
-            for browser in ["chrome", "safari", "firefox", "edge"]
-        ):
-            return 5
-        # Heavy applications
-        elif any(
-            heavy in app_name.lower()
-            for heavy in ["xcode", "photoshop", "final cut", "logic"]
-        ):
-            return 8
-        # Light applications
-        elif any(
-            light in app_name.lower()
-            for light in ["calculator", "notes", "textedit", "terminal"]
-        ):
-            return 2
-        # Default for unknown apps
-        else:
-            return 3
+        return _app_load_time(app_name)
 
     def _extract_search_query(self, goal: str) -> str:
         """Extract search query from natural language goal using generalized logic"""
@@ -1000,10 +1385,18 @@ class AgentCore:
     def _is_goal_achieved(
         self,
         goal: str,
-        perception_data: Dict[str, Any],
+        perception_data: PerceptionSnapshot,
         reasoning_result: Dict[str, Any],
     ) -> bool:
         """Check if the goal has been achieved using long-range plan criteria"""
+        # The visual reasoning already judged the current screenshot; trust a
+        # confident "done" before any criteria matching
+        if (
+            reasoning_result.get("goal_complete") is True
+            and reasoning_result.get("confidence", 0) > GOAL_COMPLETE_CONFIDENCE
+        ):
+            log.info("   ✅ Reasoning reports the goal complete")
+            return True
 
         # First, check if we have a long-range plan with success criteria
         if self.reasoning.long_range_plan:
@@ -1012,13 +1405,15 @@ class AgentCore:
             completion_indicators = plan.get("completion_indicators", [])
 
             if success_criteria or completion_indicators:
-                print(f"   🎯 Checking goal achievement against long-range plan...")
-                print(f"   📋 Success criteria: {success_criteria}")
-                print(f"   ✅ Completion indicators: {completion_indicators}")
+                log.info("   🎯 Checking goal achievement against long-range plan...")
+                log.info("   📋 Success criteria: %s", success_criteria)
+                log.info("   ✅ Completion indicators: %s", completion_indicators)
 
                 # Check if any completion indicators are present in current state
-                ui_signals = perception_data.get("ui_signals", [])
-                system_state = perception_data.get("system_state")
+                lc_signals, text_blob, title_blob = self._signal_text_index(
+                    perception_data
+                )
+                system_state = perception_data.system_state
 
                 for indicator in completion_indicators:
                     indicator_lower = indicator.lower()
@@ -1057,86 +1452,89 @@ class AgentCore:
                                                     or current_state_str
                                                     in target_state
                                                 ):
-                                                    print(
-                                                        f"   ✅ Found completion indicator: {indicator} (system state: {attr}={current_value})"
+                                                    log.info(
+                                                        "   ✅ Found completion indicator: %s (system state: %s=%s)",
+                                                        indicator,
+                                                        attr,
+                                                        current_value,
                                                     )
                                                     return True
                                     else:
                                         if current_state_str in indicator_lower:
-                                            print(
-                                                f"   ✅ Found completion indicator: {indicator} (system state: {attr}={current_value})"
+                                            log.info(
+                                                "   ✅ Found completion indicator: %s (system state: %s=%s)",
+                                                indicator,
+                                                attr,
+                                                current_value,
                                             )
                                             return True
                                 else:
                                     if current_state_str in indicator_lower:
-                                        print(
-                                            f"   ✅ Found completion indicator: {indicator} (system state: {attr}={current_value})"
+                                        log.info(
+                                            "   ✅ Found completion indicator: %s (system state: %s=%s)",
+                                            indicator,
+                                            attr,
+                                            current_value,
                                         )
                                         return True
 
-                    # Check UI element indicators with state verification
-                    for signal in ui_signals:
-                        # Safely convert to lowercase, handling non-string types
-                        title = str(signal.get("title", "")).lower()
-                        current_value_raw = signal.get("current_value", "")
-                        try:
-                            current_value = str(current_value_raw).lower()
-                        except AttributeError:
-                            current_value = str(current_value_raw)
-                        description = str(signal.get("description", "")).lower()
+                    # Skip the per-element scan when no title/description can match
+                    keywords = indicator_lower.split()
+                    if indicator_lower not in text_blob and not any(
+                        keyword in title_blob for keyword in keywords
+                    ):
+                        continue
 
+                    # For toggles/switches, only the matching states count
+                    wants_off = "off" in indicator_lower
+                    wants_on = "on" in indicator_lower
+                    checks_state = (
+                        wants_off
+                        or wants_on
+                        or "toggle" in indicator_lower
+                        or "switch" in indicator_lower
+                    )
+                    accepted = (_OFF_VALUES if wants_off else frozenset()) | (
+                        _ON_VALUES if wants_on else frozenset()
+                    )
+                    if checks_state and not accepted:
+                        continue  # a bare toggle/switch indicator never matches
+
+                    # Check UI element indicators with state verification
+                    for title, description, current_value in lc_signals:
+                        # The state test is a set lookup; do it before the text scans
+                        if checks_state and current_value not in accepted:
+                            continue
                         # Check if indicator matches element title/description
                         if (
                             indicator_lower in title
                             or indicator_lower in description
-                            or any(
-                                keyword in title for keyword in indicator_lower.split()
-                            )
+                            or any(keyword in title for keyword in keywords)
                         ):
-                            # For toggles/switches, verify the actual state
-                            if (
-                                "toggle" in indicator_lower
-                                or "switch" in indicator_lower
-                                or "off" in indicator_lower
-                                or "on" in indicator_lower
-                            ):
-                                if "off" in indicator_lower and current_value in [
-                                    "off",
-                                    "disabled",
-                                    "false",
-                                ]:
-                                    print(
-                                        f"   ✅ Found completion indicator: {indicator} (state: {current_value})"
-                                    )
-                                    return True
-                                elif "on" in indicator_lower and current_value in [
-                                    "on",
-                                    "enabled",
-                                    "true",
-                                ]:
-                                    print(
-                                        f"   ✅ Found completion indicator: {indicator} (state: {current_value})"
-                                    )
-                                    return True
+                            if checks_state:
+                                log.info(
+                                    "   ✅ Found completion indicator: %s (state: %s)",
+                                    indicator,
+                                    current_value,
+                                )
                             else:
-                                print(f"   ✅ Found completion indicator: {indicator}")
-                                return True
+                                log.info(
+                                    "   ✅ Found completion indicator: %s", indicator
+                                )
+                            return True
 
                 # No success yet if we only have confidence
 
         # Fallback to original logic if no long-range plan
-        goal_lower = goal.lower()
+        intents = _goal_intents(goal.lower())
 
         # Terminal/command execution goals
-        if any(
-            keyword in goal_lower
-            for keyword in ["echo", "command", "terminal", "iterm", "bash", "shell"]
-        ):
+        if "terminal" in intents:
             return reasoning_result.get("confidence", 0) > 0.8
 
         # Battery optimization goals
-        if "battery" in goal_lower and "optimize" in goal_lower:
-            ui_signals = perception_data.get("ui_signals", [])
+        if "battery" in intents and "optimize" in intents:
+            ui_signals = perception_data.ui_signals
             for signal in ui_signals:
                 if "low_power" in str(signal.get("id", "")).lower():
                     current_value = signal.get("current_value", "")
@@ -1149,27 +1547,24 @@ class AgentCore:
                         return True
 
         # Search goals
-        if any(keyword in goal_lower for keyword in ["search", "find", "look for"]):
+        if "search" in intents:
             return reasoning_result.get("confidence", 0) > 0.7
 
         # Calculator goals
-        if any(
-            keyword in goal_lower
-            for keyword in ["calculate", "math", "calculator", "+", "-", "*", "/"]
-        ):
+        if "math" in intents:
             return reasoning_result.get("confidence", 0) > 0.8
 
         # Video goals - check for YouTube video player elements
-        if any(keyword in goal_lower for keyword in ["video", "show", "watch", "play"]):
-            ui_signals = perception_data.get("ui_signals", [])
+        if "video" in intents:
+            ui_signals = perception_data.ui_signals
             for signal in ui_signals:
                 title = str(signal.get("title", "")).lower()
                 if any(
                     keyword in title
                     for keyword in ["play", "pause", "full screen", "seek slider"]
                 ):
-                    print(
-                        f"   ✅ Found video player element: {signal.get('title', '')}"
+                    log.info(
+                        "   ✅ Found video player element: %s", signal.get("title", "")
                     )
                     return True
 
@@ -1180,19 +1575,75 @@ class AgentCore:
 
         return False
 
+    @staticmethod
+    def _ui_fingerprint(perception_data: PerceptionSnapshot) -> int:
+        """Hash of each UI signal's role, title and value"""
+        return hash(
+            tuple(
+                (
+                    f"{signal.get('role', '')!s}",
+                    f"{signal.get('title', '')!s}",
+                    f"{signal.get('current_value', '')!s}",
+                )
+                for signal in perception_data.ui_signals
+            )
+        )
+
+    @staticmethod
+    def _signal_text_index(perception_data: PerceptionSnapshot):
+        """Lowercased (title, description, value) per UI signal plus joined search blobs.
+
+        Built once per ui_signals list and kept on perception_data.
+        """
+        ui_signals = perception_data.ui_signals
+        cached = perception_data.lc_index
+        if cached is not None and cached[0] is ui_signals:
+            return cached[1]
+
+        lc_signals = [
+            (
+                f"{signal.get('title', '')!s}".lower(),
+                f"{signal.get('description', '')!s}".lower(),
+                f"{signal.get('current_value', '')!s}".lower(),
+            )
+            for signal in ui_signals
+        ]
+        # \x1f keeps matches from spanning two elements
+        text_blob = "\x1f".join(t + "\x1f" + d for t, d, _ in lc_signals)
+        title_blob = "\x1f".join(t for t, _, _ in lc_signals)
+        index = (lc_signals, text_blob, title_blob)
+        perception_data.lc_index = (ui_signals, index)
+        return index
+
     def get_status(self) -> Dict[str, Any]:
         """Get current agent status"""
         return {
             "state": self.state,
-            "memory_size": len(self.memory.perceptions),
-            "reasoning_count": len(self.memory.reasonings),
-            "action_count": len(self.memory.actions),
+            "memory_size": self.memory.counts["perceptions"],
+            "reasoning_count": self.memory.counts["reasonings"],
+            "action_count": self.memory.counts["actions"],
         }
 
 
-def main():
-    """Main function for running the agent with CLI arguments"""
+# Static parts of the CLI banner/summary, encoded once
+_BANNER_HEAD = "🤖 AUTONOMOUS AGENT STARTING\n".encode()
+_BANNER_TAIL = f"{_SEP60}\n".encode()
+_FINISHED_HEAD = "\n🏁 AGENT FINISHED\n".encode()
+
+
+def _write_stdout(*parts) -> None:
+    """Write bytes/str parts to stdout in one call, ahead of any later logging"""
     import sys
+
+    sys.stdout.flush()  # anything already print()ed goes first
+    out = sys.stdout.buffer
+    out.write(b"".join(p if isinstance(p, bytes) else p.encode() for p in parts))
+    out.flush()
+
+
+@lru_cache(maxsize=1)
+def _get_parser():
+    """CLI argument parser, built once per process"""
     import argparse
 
     # Set up argument parser
@@ -1240,56 +1691,121 @@ Examples:
         default=True,
         help="Save results to JSON file (default: True)",
     )
+    parser.add_argument(
+        "--no-save",
+        dest="save_results",
+        action="store_false",
+        help="Don't write the results JSON file",
+    )
+    parser.add_argument(
+        "--no-compress",
+        dest="compress",
+        action="store_false",
+        help="Always write plain JSON, even for results over 64 KB",
+    )
+    return parser
+
 
+def main():
+    """Main function for running the agent with CLI arguments"""
     # Parse arguments
-    args = parser.parse_args()
+    args = _get_parser().parse_args()
+
+    configure_logging(args.verbose, buffered=True)
 
     # Create agent
-    agent = AgentCore()
+    agent = AgentCore(max_iterations=args.max_iterations, max_errors=args.max_errors)
+
+    _write_stdout(
+        _BANNER_HEAD,
+        f"Goal: {args.goal}\n"
+        f"Target App: {args.target_app}\n"
+        f"Max Iterations: {args.max_iterations}\n"
+        f"Max Errors: {args.max_errors}\n",
+        _BANNER_TAIL,
+    )
 
-    # Configure agent based on arguments
-    agent.max_iterations = args.max_iterations
-    agent.max_errors = args.max_errors
+    def _on_sigint(signum, frame):
+        # First Ctrl+C lets the loop finish its current step and return;
+        # a second one interrupts right away
+        if agent.state.cancelled:
+            raise KeyboardInterrupt
+        agent.state.cancelled = True
+        print("\n⏹️  Stopping after the current step (Ctrl+C again to abort)")
 
-    print(f"🤖 AUTONOMOUS AGENT STARTING")
-    print(f"Goal: {args.goal}")
-    print(f"Target App: {args.target_app}")
-    print(f"Max Iterations: {args.max_iterations}")
-    print(f"Max Errors: {args.max_errors}")
-    print("=" * 60)
+    import signal
 
+    prev_sigint = signal.signal(signal.SIGINT, _on_sigint)
+    progress_fp = None
     try:
+        if args.save_results:
+            # One translate() pass; both result files share the stem
+            stem = f"agent_result_{args.goal.translate(_FILENAME_TBL)[:120]}"
+            # Iteration records stream here while the loop runs; the full
+            # result still lands in the .json file at the end
+            progress_name = stem + ".ndjson"
+            progress_fp = open(progress_name, "wb", buffering=128 * 1024)
+
         # Run autonomous loop
         result = agent.run_autonomous_loop(
             goal=args.goal,
             target_app=args.target_app,
             max_iterations=args.max_iterations,
+            result_fp=progress_fp,
         )
 
         # Ensure result is not None
         if result is None:
-            result = {
-                "success": False,
-                "iterations": 0,
-                "errors": agent.state.error_count,
-                "progress": 0.0,
-                "message": "Agent completed without returning result",
-            }
+            result = {**_NONE_RESULT, "errors": agent.state.error_count}
 
         # Save results if requested
+        saved_msg = ""
         if args.save_results:
-            filename = f"agent_result_{args.goal.replace(' ', '_')}.json"
-            with open(filename, "w") as f:
-                json.dump(result, f, indent=2, default=str)
-            print(f"\n💾 Results saved to {filename}")
+            filename = stem + ".json"
+            if ORJSON_AVAILABLE:
+                buf = orjson.dumps(
+                    result,
+                    default=str,
+                    option=orjson.OPT_INDENT_2
+                    | orjson.OPT_SERIALIZE_NUMPY
+                    | orjson.OPT_NON_STR_KEYS,
+                )
+            else:
+                buf = json.dumps(result, indent=2, default=str).encode()
+            if args.compress and len(buf) > COMPRESS_THRESHOLD:
+                import gzip
+
+                # Level 1: nearly all of the size win at a fraction of the CPU
+                buf = gzip.compress(buf, compresslevel=1)
+                filename += ".gz"
+            # Write aside and swap in, so readers never see a half-written file
+            tmp = filename + ".tmp"
+            with open(tmp, "wb", buffering=64 * 1024) as f:
+                f.write(buf)
+            os.replace(tmp, filename)
+            progress_fp.write(_json_line({"summary": result}))
+            saved_msg = (
+                f"\n💾 Results saved to {filename} (progress in {progress_name})\n"
+            )
 
         # Print final summary
-        print(f"\n🏁 AGENT FINISHED")
-        print(f"   Goal: {args.goal}")
-        print(f"   Success: {result['success']}")
-        print(f"   Iterations: {result['iterations']}")
-        print(f"   Errors: {result['errors']}")
-        print(f"   Final Progress: {result['progress']:.2f}")
+        get = result.get
+        success, iterations, errors, progress = (
+            get("success", False),
+            get("iterations", 0),
+            get("errors", agent.state.error_count),
+            get("progress", 0.0),
+        )
+        # The save notice and the summary go out in the same write
+        _write_stdout(
+            saved_msg,
+            _FINISHED_HEAD,
+            f"   Goal: {args.goal}\n"
+            f"   Success: {success}\n"
+            f"   Iterations: {iterations}\n"
+            f"   Errors: {errors}\n"
+            f"   Final Progress: {progress:.2f}\n",
+        )
 
     except KeyboardInterrupt:
         print("\n⏹️  Agent stopped by user")
@@ -1299,6 +1815,10 @@ Examples:
             import traceback
 
             traceback.print_exc()
+    finally:
+        signal.signal(signal.SIGINT, prev_sigint)
+        if progress_fp is not None:
+            progress_fp.close()
 
 
 if __name__ == "__main__":
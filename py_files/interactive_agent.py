@@ -4,7 +4,7 @@ Interactive Agent - Interactive goal selection and execution
 """
 
 import sys
-from agent_core import AgentCore
+from agent_core import AgentCore, configure_logging
 
 
 def show_goal_menu():
@@ -121,6 +121,8 @@ def run_agent(goal, target_app, max_iterations=10, max_errors=5, verbose=False):
     print(f"Max Errors: {max_errors}")
     print("=" * 50)
     
+    configure_logging(verbose)
+
     try:
         agent = AgentCore()
         agent.max_iterations = max_iterations
@@ -6,11 +6,12 @@ The simplest way to get started with the agent system.
 
 import sys
 import os
-from agent_core import AgentCore
+from agent_core import AgentCore, configure_logging
 
 
 def main():
     """Main entry point with simple goal selection"""
+    configure_logging()
 
     print("🤖 Autonomous Agent System")
     print("=" * 50)
@@ -3,16 +3,22 @@
 Memory System - Handles storage and retrieval of agent experiences
 """
 
+from collections import Counter, deque
 from typing import Dict, List, Any, Optional
 import time
 
 class MemorySystem:
     """Handles storage and retrieval of agent memories"""
     
-    def __init__(self):
-        self.perceptions = []
-        self.reasonings = []
-        self.actions = []
+    MAX_KEEP = 5  # raw entries kept per kind; older ones only live on in the summary
+    
+    def __init__(self, max_keep: int = MAX_KEEP):
+        self.perceptions = deque(maxlen=max_keep)
+        self.reasonings = deque(maxlen=max_keep)
+        self.actions = deque(maxlen=max_keep)
+        # Totals and a rolling digest of everything stored, evicted or not
+        self.counts = {"perceptions": 0, "reasonings": 0, "actions": 0}
+        self._summary = {"role_counts": Counter(), "system_state": None, "last_seen": None}
     
     def store_perception(self, ui_signals: List[Dict], system_state: Dict, 
                         context: Dict, visual_analysis: Any, 
@@ -26,11 +32,31 @@ class MemorySystem:
             "correlations": correlations,
             "timestamp": timestamp
         })
+        self.counts["perceptions"] += 1
+        self._summary["role_counts"].update(s.get("role", "unknown") for s in ui_signals)
+        if system_state is not None:
+            self._summary["system_state"] = system_state
+        self._summary["last_seen"] = timestamp
     
     def store_reasoning(self, reasoning_result: Dict[str, Any]) -> None:
         """Store reasoning result in memory"""
         self.reasonings.append(reasoning_result)
+        self.counts["reasonings"] += 1
     
     def store_actions(self, action_results: List[Dict[str, Any]]) -> None:
         """Store action results in memory"""
-        self.actions.extend(action_results)
\ No newline at end of file
+        self.actions.extend(action_results)
+        self.counts["actions"] += len(action_results)
+    
+    def latest_perception(self) -> Optional[Dict[str, Any]]:
+        """Most recent stored perception, if any"""
+        return self.perceptions[-1] if self.perceptions else None
+    
+    def get_summary(self) -> Dict[str, Any]:
+        """Consolidated view of all stored perceptions"""
+        return {
+            "role_counts": dict(self._summary["role_counts"]),
+            "system_state": self._summary["system_state"],
+            "last_seen": self._summary["last_seen"],
+            **self.counts,
+        }
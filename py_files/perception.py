@@ -5,12 +5,33 @@ Perception Engine - Handles all environmental perception and signal discovery
 
 import time
 import psutil
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 import atomacos as atomac
 from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import os
 import sys
 
+# Slotted dataclasses need Python 3.10+
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Titles too generic to count as a text match when correlating elements
+_GENERIC_TEXT = frozenset({"button", "turn off", "click"})
+
+# Common app name variations -> the localized name atomac looks up
+APP_NAME_MAPPINGS = {
+    "iTerm": "iTerm2",
+    "iTerm2": "iTerm2",
+    "Terminal": "Terminal",
+    "Google Chrome": "Google Chrome",
+    "Chrome": "Google Chrome",
+    "Safari": "Safari",
+    "Calculator": "Calculator",
+    "System Settings": "System Settings",
+    "System Preferences": "System Settings",  # Old name
+}
+
 # Add model directory to path for VLM integration
 sys.path.append(os.path.join(os.path.dirname(__file__), "model"))
 try:
@@ -73,6 +94,25 @@ class VisualAnalysis:
     safety_warnings: List[str]
     alternative_methods: List[str]
     task_context: str = ""
+    screenshot_path: str = ""  # image the analysis was run on
+
+
+@dataclass(**_SLOTS)
+class PerceptionSnapshot:
+    """Result of one hybrid perception pass"""
+
+    ui_signals: List[Dict[str, Any]] = field(default_factory=list)
+    system_state: Optional[SystemState] = None
+    visual_analysis: Optional[VisualAnalysis] = None
+    correlations: Optional[Dict[str, Any]] = None
+    perception_type: str = "accessibility_only"
+    target_app: str = ""
+    screenshot_path: Optional[str] = None
+    context: Dict[str, Any] = field(default_factory=dict)
+    constraints: List[str] = field(default_factory=list)
+    timestamp: float = 0.0
+    error: Optional[str] = None
+    lc_index: Optional[tuple] = None  # lowercased UI text, built on first goal check
 
 
 class PerceptionEngine:
@@ -84,9 +124,15 @@ class PerceptionEngine:
     - Signal processing
     """
 
+    # The AX scan runs on a worker thread while the screenshot + VLM call runs here
+    supports_parallel = True
+    _APP_REF_TTL = 2.0  # seconds a found app ref is reused across scans
+
     def __init__(self):
         self.seen_elements = set()
         self.perception_history = []
+        self._scan_pool = ThreadPoolExecutor(max_workers=1)
+        self._app_ref_cache: Dict[str, tuple] = {}
 
         # Initialize VLM if available
         self.vlm_analyzer = None
@@ -100,21 +146,20 @@ class PerceptionEngine:
 
     def _normalize_app_name(self, app_name: str) -> str:
         """Normalize app names to handle common variations"""
-        # Common app name mappings
-        name_mappings = {
-            "iTerm": "iTerm2",
-            "iTerm2": "iTerm2",
-            "Terminal": "Terminal",
-            "Google Chrome": "Google Chrome",
-            "Chrome": "Google Chrome",
-            "Safari": "Safari",
-            "Calculator": "Calculator",
-            "System Settings": "System Settings",
-            "System Preferences": "System Settings",  # Old name
-        }
-
         # Return mapped name or original if no mapping exists
-        return name_mappings.get(app_name, app_name)
+        return APP_NAME_MAPPINGS.get(app_name, app_name)
+
+    def _app_ref(self, name: str):
+        """atomac app ref by localized name; found refs are reused for _APP_REF_TTL"""
+        now = time.monotonic()
+        hit = self._app_ref_cache.get(name)
+        if hit and now - hit[0] < self._APP_REF_TTL:
+            return hit[1]
+        app = atomac.getAppRefByLocalizedName(name)
+        if app:
+            # Misses are not cached so a just-launched app is found on the next scan
+            self._app_ref_cache[name] = (now, app)
+        return app
 
     def discover_ui_signals(self, target_app: str = None) -> List[Dict[str, Any]]:
         """Discover all available UI elements and their capabilities"""
@@ -132,9 +177,10 @@ class PerceptionEngine:
                     f"   🎯 Looking for app: {target_app} (normalized: {normalized_app_name})"
                 )
                 try:
-                    app = atomac.getAppRefByLocalizedName(normalized_app_name)
+                    app = self._app_ref(normalized_app_name)
                 except Exception as e:
                     print(f"   ⚠️  Error getting app reference: {e}")
+                    self._app_ref_cache.pop(normalized_app_name, None)
                     app = None
 
                 if not app:
@@ -693,6 +739,7 @@ class PerceptionEngine:
                 safety_warnings=analysis_result.get("safety_warnings", []),
                 alternative_methods=analysis_result.get("alternative_methods", []),
                 task_context=goal,
+                screenshot_path=screenshot_path,
             )
 
             print(
@@ -709,34 +756,68 @@ class PerceptionEngine:
     ) -> Dict[str, Any]:
         """Correlate accessibility elements with visual elements"""
         correlations = []
+        visual_elements = visual_analysis.interactive_elements
+        if not ui_signals or not visual_elements:
+            return {
+                "correlations": correlations,
+                "total_ui_signals": len(ui_signals),
+                "total_visual_elements": len(visual_elements),
+                "matched_elements": 0,
+            }
 
-        for ui_signal in ui_signals:
-            ui_pos = ui_signal.get("position", (0, 0))
+        # Per-element values, lowered once instead of once per (signal, element) pair
+        visual = [
+            (
+                element,
+                bool(element.text),
+                element.text.strip().lower() if element.text else "",
+                element.type.lower(),
+                element.purpose.lower(),
+            )
+            for element in visual_elements
+        ]
+
+        # Position correlation for every pair at once: within 50 pixels
+        ui_xy = np.array(
+            [ui_signal.get("position", (0, 0))[:2] for ui_signal in ui_signals],
+            dtype=np.float64,
+        )
+        vis_xy = np.array(
+            [
+                (e.coordinates.get("click_x", 0), e.coordinates.get("click_y", 0))
+                for e in visual_elements
+                if e.coordinates
+            ]
+            or [(0, 0)],
+            dtype=np.float64,
+        )
+        # Elements without coordinates never get the position bonus
+        has_coords = np.array([bool(e.coordinates) for e in visual_elements])
+        near = np.zeros((len(ui_signals), len(visual_elements)), dtype=bool)
+        if has_coords.any():
+            dist2 = ((ui_xy[:, None, :] - vis_xy[None, :, :]) ** 2).sum(axis=2)
+            near[:, has_coords] = dist2 < 2500.0
+        near = near.tolist()
+
+        for i, ui_signal in enumerate(ui_signals):
             ui_title = ui_signal.get("title", "").lower()
             ui_type = ui_signal.get("type", "").lower()
+            ui_desc = ui_signal.get("description", "").lower()
+            ui_title_clean = ui_title.strip()
+            ui_generic = ui_title_clean in _GENERIC_TEXT
 
             best_match = None
             best_score = 0
 
-            for visual_element in visual_analysis.interactive_elements:
+            for is_near, visual_values in zip(near[i], visual):
+                visual_element, has_text, vis_text_clean, vis_type, vis_purpose = (
+                    visual_values
+                )
                 # Calculate correlation score
-                score = 0
-
-                # Position correlation (if coordinates available)
-                if visual_element.coordinates:
-                    vis_x = visual_element.coordinates.get("click_x", 0)
-                    vis_y = visual_element.coordinates.get("click_y", 0)
-                    distance = (
-                        (ui_pos[0] - vis_x) ** 2 + (ui_pos[1] - vis_y) ** 2
-                    ) ** 0.5
-                    if distance < 50:  # Within 50 pixels
-                        score += 3
+                score = 3 if is_near else 0
 
                 # Text correlation (be more selective)
-                if ui_title and visual_element.text:
-                    ui_title_clean = ui_title.strip().lower()
-                    vis_text_clean = visual_element.text.strip().lower()
-
+                if ui_title and has_text:
                     # Only match if there's a meaningful overlap (not just generic text)
                     if (
                         ui_title_clean == vis_text_clean  # Exact match
@@ -749,25 +830,15 @@ class PerceptionEngine:
                     ):
                         score += 2
                     # Penalize generic matches
-                    elif ui_title_clean in [
-                        "button",
-                        "turn off",
-                        "click",
-                    ] or vis_text_clean in ["button", "turn off", "click"]:
+                    elif ui_generic or vis_text_clean in _GENERIC_TEXT:
                         score -= 1  # Penalize generic matches
 
                 # Type correlation
-                if (
-                    ui_type in visual_element.type.lower()
-                    or visual_element.type.lower() in ui_type
-                ):
+                if ui_type in vis_type or vis_type in ui_type:
                     score += 1
 
                 # Purpose correlation
-                if (
-                    ui_signal.get("description", "").lower()
-                    in visual_element.purpose.lower()
-                ):
+                if ui_desc in vis_purpose:
                     score += 1
 
                 if score > best_score:
@@ -808,16 +879,24 @@ class PerceptionEngine:
             "matched_elements": len(unique_correlations),
         }
 
-    def get_hybrid_perception(self, target_app: str, goal: str = "") -> Dict[str, Any]:
+    def _scan_accessibility(self, target_app: str):
+        """Accessibility elements and system state"""
+        return self.discover_ui_signals(target_app), self.get_system_state()
+
+    def get_hybrid_perception(
+        self, target_app: str, goal: str = ""
+    ) -> PerceptionSnapshot:
         """Get combined accessibility and visual perception data"""
         print("   🔍 Gathering hybrid perception (accessibility + visual)...")
 
-        # Get accessibility data
-        ui_signals = self.discover_ui_signals(target_app)
-        system_state = self.get_system_state()
-
-        # Get visual analysis
-        visual_analysis = self.capture_visual_analysis(target_app, goal)
+        if self.supports_parallel and self.vlm_analyzer:
+            # Accessibility scan alongside the (much slower) visual analysis
+            scan = self._scan_pool.submit(self._scan_accessibility, target_app)
+            visual_analysis = self.capture_visual_analysis(target_app, goal)
+            ui_signals, system_state = scan.result()
+        else:
+            ui_signals, system_state = self._scan_accessibility(target_app)
+            visual_analysis = self.capture_visual_analysis(target_app, goal)
 
         # Correlate the two
         correlations = None
@@ -826,10 +905,14 @@ class PerceptionEngine:
                 ui_signals, visual_analysis
             )
 
-        return {
-            "ui_signals": ui_signals,
-            "system_state": system_state,
-            "visual_analysis": visual_analysis,
-            "correlations": correlations,
-            "perception_type": "hybrid" if visual_analysis else "accessibility_only",
-        }
+        return PerceptionSnapshot(
+            ui_signals=ui_signals,
+            system_state=system_state,
+            visual_analysis=visual_analysis,
+            correlations=correlations,
+            perception_type="hybrid" if visual_analysis else "accessibility_only",
+            target_app=target_app or "",
+            screenshot_path=(
+                visual_analysis.screenshot_path if visual_analysis else None
+            ),
+        )
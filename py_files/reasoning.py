@@ -3,11 +3,13 @@
 Reasoning Engine - Handles all reasoning, planning, and decision-making
 """
 
+from __future__ import annotations
+
 import json
 import os
 import time
 import google.generativeai as genai
-from typing import Dict, List, Any, Optional
+from typing import TYPE_CHECKING, Dict, List, Any, Optional
 from dataclasses import dataclass
 from dotenv import load_dotenv
 from macos_settings_map import (
@@ -16,6 +18,9 @@ from macos_settings_map import (
     MACOS_SETTINGS_MAP,
 )
 
+if TYPE_CHECKING:
+    from perception import PerceptionSnapshot
+
 # Load environment variables
 load_dotenv()
 
@@ -50,6 +55,8 @@ class ReasoningEngine:
         self.plan_created = False
         self._last_gemini_request_time = 0.0  # Track last API call for throttling
         self.settings_map = MACOS_SETTINGS_MAP  # macOS settings mapping
+        # goal -> (domain knowledge, best practices); neither depends on perception
+        self._goal_knowledge: Dict[str, tuple] = {}
 
     def _throttle_gemini_request(self):
         """Throttle Gemini API requests to avoid 429 rate limits"""
@@ -163,13 +170,22 @@ class ReasoningEngine:
         except Exception as e:
             return {"error": f"Plan creation failed: {e}"}
 
-    def gather_knowledge(self, goal: str, perception: Dict[str, Any]) -> Dict[str, Any]:
+    def gather_knowledge(
+        self, goal: str, perception: PerceptionSnapshot
+    ) -> Dict[str, Any]:
         """Gather relevant knowledge for the goal"""
         print("   🧠 Gathering knowledge...")
 
+        # The goal stays fixed for a run, so only the perception part is redone
+        cached = self._goal_knowledge.get(goal)
+        if cached is None:
+            cached = (self._get_domain_knowledge(goal), self._get_best_practices(goal))
+            self._goal_knowledge[goal] = cached
+        domain_knowledge, best_practices = cached
+
         return {
-            "domain_knowledge": self._get_domain_knowledge(goal),
-            "best_practices": self._get_best_practices(goal),
+            "domain_knowledge": dict(domain_knowledge),
+            "best_practices": list(best_practices),
             "system_recommendations": self._get_system_recommendations(perception),
             "historical_context": self._get_historical_context(goal),
         }
@@ -177,7 +193,7 @@ class ReasoningEngine:
     def analyze_situation(
         self,
         goal: str,
-        perception: Dict[str, Any],
+        perception: PerceptionSnapshot,
         knowledge: Dict[str, Any],
         agent_state: Any,
     ) -> Dict[str, Any]:
@@ -241,7 +257,7 @@ class ReasoningEngine:
         return reasoning_result
 
     def analyze_with_visual(
-        self, goal: str, perception: Dict[str, Any], screenshot_path: str = None
+        self, goal: str, perception: PerceptionSnapshot, screenshot_path: str = None
     ) -> Dict[str, Any]:
         """
         Combined visual analysis and reasoning in a single API call.
@@ -332,7 +348,7 @@ class ReasoningEngine:
             return {"error": str(e), "plan": [], "confidence": 0.0}
 
     def _build_visual_reasoning_prompt(
-        self, goal: str, perception: Dict[str, Any], screenshot_path: str = None
+        self, goal: str, perception: PerceptionSnapshot, screenshot_path: str = None
     ) -> str:
         """
         Build comprehensive prompt for combined visual analysis and reasoning.
@@ -340,10 +356,10 @@ class ReasoningEngine:
         This method creates a single prompt that handles both visual analysis
         and reasoning in one API call, reducing costs and improving efficiency.
         """
-        ui_signals = perception.get("ui_signals", [])
-        system_state = perception.get("system_state")
-        visual_analysis = perception.get("visual_analysis")
-        correlations = perception.get("correlations")
+        ui_signals = perception.ui_signals
+        system_state = perception.system_state
+        visual_analysis = perception.visual_analysis
+        correlations = perception.correlations
 
         # Get settings panel information for the goal
         settings_info = find_settings_panel(goal)
@@ -446,6 +462,7 @@ Respond with JSON:
         {{"action": "action_type", "target": "element_id", "text": "text_to_type", "key": "key_name", "reason": "why this action"}}
     ],
     "confidence": 0.0-1.0,
+    "goal_complete": true if the screenshot shows the goal is already achieved, else false,
     "reasoning": "explanation of your approach",
     "alternatives": ["other approaches if needed"],
     "risks": ["potential issues and mitigations"],
@@ -456,7 +473,7 @@ Respond with JSON:
     def _build_reasoning_prompt(
         self,
         goal: str,
-        perception: Dict[str, Any],
+        perception: PerceptionSnapshot,
         knowledge: Dict[str, Any],
         agent_state: Any,
     ) -> str:
@@ -476,10 +493,10 @@ Respond with JSON:
             Formatted prompt string for Gemini reasoning
         """
 
-        ui_signals = perception.get("ui_signals", [])
-        system_state = perception.get("system_state", {})
-        visual_analysis = perception.get("visual_analysis")
-        correlations = perception.get("correlations")
+        ui_signals = perception.ui_signals
+        system_state = perception.system_state
+        visual_analysis = perception.visual_analysis
+        correlations = perception.correlations
 
         return f"""
         You are an autonomous AI agent with hybrid perception capabilities that can interact 
@@ -915,12 +932,12 @@ Respond with JSON:
 
         return relevant_practices
 
-    def _get_system_recommendations(self, perception: Dict[str, Any]) -> List[str]:
+    def _get_system_recommendations(self, perception: PerceptionSnapshot) -> List[str]:
         """Get system-specific recommendations"""
         recommendations = []
 
-        system_state = perception.get("system_state")
-        constraints = perception.get("constraints", [])
+        system_state = perception.system_state
+        constraints = perception.constraints
 
         if "low_battery" in constraints:
             recommendations.append("Consider enabling Low Power Mode")